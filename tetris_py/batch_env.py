@@ -0,0 +1,166 @@
+"""
+NumPy로 여러 보드를 한꺼번에 진행시키는 배치 시뮬레이터 모듈.
+engine.TetrisEngine 과 같은 규칙(충돌, 고정, tetris2.py 방식의 100/300/500/800 점수)을 따르지만
+N개의 보드를 (N, GRID_HEIGHT, GRID_WIDTH) 배열 하나로 들고 한 번의 호출로 보드마다 액션 하나씩을 적용합니다.
+봇 학습과 평가용이며 pygame이 필요 없습니다.
+"""
+import numpy as np
+
+from engine import GRID_WIDTH, GRID_HEIGHT, ROTATIONS, SPAWN_X, LINE_SCORES, LEFT, RIGHT, DOWN, ROTATE, DROP
+
+# 블록 종류 수와 블록당 칸 수
+NUM_SHAPES = len(ROTATIONS)
+CELLS_PER_PIECE = 4
+
+# CELL_X/CELL_Y[블록 인덱스, 회전 번호] -> 채워진 칸 4개의 상대 좌표
+CELL_X = np.array([[[x for x, _ in state.cells] for state in rotations] for rotations in ROTATIONS], dtype=np.int64)
+CELL_Y = np.array([[[y for _, y in state.cells] for state in rotations] for rotations in ROTATIONS], dtype=np.int64)
+
+# 블록이 처음 나타나는 x 좌표 (블록 인덱스 배열로 바로 찾기 위한 배열)
+SPAWN = np.array(SPAWN_X, dtype=np.int64)
+
+
+def line_score_table(line_scores):
+    """
+    지운 줄 수 -> 점수 사전을 지운 줄 수로 바로 찾을 수 있는 배열로 바꾸는 함수.
+    """
+    return np.array([line_scores.get(n, 0) for n in range(CELLS_PER_PIECE + 1)], dtype=np.int64)
+
+
+class BatchTetris:
+    """
+    N개의 테트리스 보드를 한꺼번에 진행시키는 클래스.
+    boards는 칸마다 블록 번호(0은 빈 칸)를 담은 (N, GRID_HEIGHT, GRID_WIDTH) uint8 배열이고,
+    떨어지는 블록은 보드별 배열(piece, rotation, x, y)로 들고 있습니다.
+    """
+    def __init__(self, n, seed=None, line_scores=LINE_SCORES):
+        self.n = n
+        self.rng = np.random.default_rng(seed)
+        self.score_table = line_score_table(line_scores)
+        self.boards = np.zeros((n, GRID_HEIGHT, GRID_WIDTH), dtype=np.uint8)
+        self.piece = np.zeros(n, dtype=np.int64)
+        self.next_piece = np.zeros(n, dtype=np.int64)
+        self.rotation = np.zeros(n, dtype=np.int64)
+        self.x = np.zeros(n, dtype=np.int64)
+        self.y = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.lines = np.zeros(n, dtype=np.int64)
+        self.game_over = np.zeros(n, dtype=bool)
+        self.reset()
+
+    def reset(self, mask=None):
+        """
+        보드를 초기화하는 함수. mask가 있으면 True인 보드만 초기화합니다.
+        """
+        idx = np.arange(self.n) if mask is None else np.flatnonzero(mask)
+        self.boards[idx] = 0
+        self.score[idx] = 0
+        self.lines[idx] = 0
+        self.game_over[idx] = False
+        self.next_piece[idx] = self.rng.integers(0, NUM_SHAPES, len(idx))
+        self.spawn(idx)
+
+    def spawn(self, idx):
+        """
+        다음 블록을 현재 블록으로 꺼내고 새 다음 블록을 뽑는 함수.
+        새 블록이 나타나자마자 충돌하는 보드는 게임 종료로 표시합니다.
+        """
+        self.piece[idx] = self.next_piece[idx]
+        self.next_piece[idx] = self.rng.integers(0, NUM_SHAPES, len(idx))
+        self.rotation[idx] = 0
+        self.x[idx] = SPAWN[self.piece[idx]]
+        self.y[idx] = 0
+        self.game_over[idx] |= self.collides(idx, self.rotation[idx], self.x[idx], self.y[idx])
+
+    def collides(self, idx, rotation, x, y):
+        """
+        idx 보드들의 현재 블록을 주어진 회전과 위치에 놓으면 충돌하는지 한꺼번에 확인하는 함수.
+        """
+        piece = self.piece[idx]
+        cx = x[:, None] + CELL_X[piece, rotation]
+        cy = y[:, None] + CELL_Y[piece, rotation]
+        outside = (cx < 0) | (cx >= GRID_WIDTH) | (cy < 0) | (cy >= GRID_HEIGHT)
+        occupied = self.boards[idx[:, None], np.clip(cy, 0, GRID_HEIGHT - 1), np.clip(cx, 0, GRID_WIDTH - 1)] != 0
+        return (outside | occupied).any(axis=1)
+
+    def step(self, actions):
+        """
+        보드마다 액션 하나를 적용한 뒤 중력 한 번을 적용하는 함수.
+        DROP은 블록을 바로 고정하고, 나머지 액션은 적용 후 한 칸 내려가지 못하면 고정합니다.
+        (보드별 점수 증가량, 게임 종료 여부)를 반환합니다. 종료된 보드는 reset(mask)으로 다시 시작합니다.
+        """
+        actions = np.asarray(actions)
+        idx = np.flatnonzero(~self.game_over)
+        act = actions[idx]
+
+        # 좌우 이동, 아래 이동, 회전
+        x = self.x[idx] + (act == RIGHT) - (act == LEFT)
+        y = self.y[idx] + (act == DOWN)
+        rotation = (self.rotation[idx] + (act == ROTATE)) & 3
+        moved = ~self.collides(idx, rotation, x, y)
+        ok = idx[moved]
+        self.x[ok] = x[moved]
+        self.y[ok] = y[moved]
+        self.rotation[ok] = rotation[moved]
+
+        # 하드 드롭: 떨어지는 보드만 남기면서 한 줄씩 내림
+        dropping = idx[act == DROP]
+        self.drop(dropping)
+
+        # 중력: 드롭하지 않은 보드는 한 칸 내리고, 못 내리면 고정
+        falling = idx[act != DROP]
+        blocked = self.collides(falling, self.rotation[falling], self.x[falling], self.y[falling] + 1)
+        self.y[falling[~blocked]] += 1
+
+        locking = np.concatenate((dropping, falling[blocked]))
+        reward = np.zeros(self.n, dtype=np.int64)
+        reward[locking] = self.lock(locking)
+        return reward, self.game_over.copy()
+
+    def drop(self, idx):
+        """
+        idx 보드들의 블록을 바닥까지 내리는 함수.
+        """
+        while len(idx):
+            blocked = self.collides(idx, self.rotation[idx], self.x[idx], self.y[idx] + 1)
+            idx = idx[~blocked]
+            self.y[idx] += 1
+
+    def lock(self, idx):
+        """
+        idx 보드들의 블록을 고정하고, 가득 찬 줄을 지운 뒤 새 블록을 꺼내는 함수.
+        보드별 점수 증가량을 반환합니다.
+        """
+        if not len(idx):
+            return np.zeros(0, dtype=np.int64)
+        piece = self.piece[idx]
+        rotation = self.rotation[idx]
+        cx = self.x[idx, None] + CELL_X[piece, rotation]
+        cy = self.y[idx, None] + CELL_Y[piece, rotation]
+        self.boards[idx[:, None], cy, cx] = (piece + 1)[:, None]
+
+        # 가득 찬 줄 찾기
+        boards = self.boards[idx]
+        full = (boards != 0).all(axis=2)
+        cleared = full.sum(axis=1)
+
+        # 줄을 지운 보드만 압축: 가득 찬 줄을 위로 보내고(안정 정렬) 비움
+        has_lines = cleared > 0
+        if has_lines.any():
+            sub = boards[has_lines]
+            order = np.argsort(~full[has_lines], axis=1, kind='stable')
+            sub = np.take_along_axis(sub, order[:, :, None], axis=1)
+            sub[np.arange(GRID_HEIGHT)[None, :] < cleared[has_lines][:, None]] = 0
+            self.boards[idx[has_lines]] = sub
+
+        reward = self.score_table[cleared]
+        self.score[idx] += reward
+        self.lines[idx] += cleared
+        self.spawn(idx)
+        return reward
+
+    def occupancy(self):
+        """
+        보드별 점유 여부를 (N, GRID_HEIGHT, GRID_WIDTH) bool 배열로 반환하는 함수.
+        """
+        return self.boards != 0
@@ -0,0 +1,238 @@
+"""
+엔진과 렌더러의 주요 함수(check_collision, rotate_shape, lock_shape, clear_lines, draw_grid, 한 프레임)를
+보드 채움 정도와 보드 크기별로 측정하는 벤치마크 모듈.
+게임을 새 프로세스로 띄워 첫 화면까지 걸리는 시간(소스 실행과 dist/ 의 PyInstaller 실행 파일)과 실행 파일 크기도 잽니다.
+SDL 더미 비디오 드라이버에서 실행되므로 창이 뜨지 않으며, 결과는 JSON 파일로 저장해 실행끼리 비교할 수 있습니다.
+
+사용법:
+  python bench.py [-o 결과.json] [--label 이름] [--repeat 횟수] [--startup 횟수] [--dist 폴더]
+  python bench.py --compare 이전.json 새.json [--threshold 0.1]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from engine import TetrisEngine, GRID_WIDTH, GRID_HEIGHT  # noqa: E402
+
+# 측정할 보드 채움 정도 (아래쪽에서부터 채운 줄의 비율)
+FILL_LEVELS = (0.0, 0.25, 0.5, 0.75)
+# 측정할 보드 크기 (너비, 높이)
+BOARD_SIZES = ((GRID_WIDTH, GRID_HEIGHT), (40, 400), (200, 2000))
+# 시작 시간을 잴 front-end
+FRONTENDS = ('tetris', 'tetris2')
+# front-end가 첫 화면을 그린 뒤 바로 끝나게 하는 환경 변수
+STARTUP_ENV = 'TETRIS_EXIT_AFTER_FIRST_FRAME'
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def fill_board(engine, fill, rng, full_rows=0):
+    """
+    엔진 보드의 아래쪽 fill 비율만큼의 줄을 무작위로 채우는 함수.
+    각 줄에는 빈 칸이 적어도 하나 있고, full_rows만큼의 맨 아래 줄은 가득 채웁니다.
+    """
+    engine.reset(seed=rng.getrandbits(32))
+    width, height = engine.width, engine.height
+    filled = int(height * fill)
+    for y in range(height - filled, height):
+        if y >= height - full_rows:
+            mask = engine.full_row
+        else:
+            mask = rng.getrandbits(width) & ~(1 << rng.randrange(width))
+        engine.rows[y] = mask
+        for x in range(width):
+            if mask >> x & 1:
+                engine.cells[y * width + x] = rng.randint(1, 7)
+    engine.update_heights(0)
+    engine.rehash()
+    engine.board_version += 1
+
+
+def measure(func, repeat, setup=None):
+    """
+    func를 repeat번 호출하며 한 번씩 시간을 재는 함수. setup은 호출 전마다 실행되며 시간에 포함되지 않습니다.
+    초당 호출 수와 p50/p99 지연 시간(마이크로초)을 반환합니다.
+    """
+    timer = time.perf_counter_ns
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = timer()
+        func()
+        samples.append(timer() - start)
+    samples.sort()
+    total = sum(samples)
+    return {
+        'ops_per_sec': repeat * 1e9 / total if total else float('inf'),
+        'p50_us': samples[len(samples) // 2] / 1000,
+        'p99_us': samples[min(len(samples) - 1, len(samples) * 99 // 100)] / 1000,
+    }
+
+
+def bench_engine(fill, repeat, rng, width=GRID_WIDTH, height=GRID_HEIGHT):
+    """
+    엔진 함수들을 측정하는 함수. (이름, 결과) 목록을 반환합니다.
+    """
+    engine = TetrisEngine(width=width, height=height)
+    fill_board(engine, fill, rng)
+    state = engine.checkpoint()
+    results = [('engine.check_collision', measure(engine.check_collision, repeat)),
+               ('engine.rotate_shape', measure(engine.rotate_shape, repeat))]
+
+    def drop_to_landing():
+        engine.restore(state)
+        engine.current_shape = engine.ghost_piece()
+    results.append(('engine.lock_shape', measure(engine.lock_shape, repeat, drop_to_landing)))
+
+    fill_board(engine, max(fill, 0.25), rng, full_rows=2)
+    cleared_state = engine.checkpoint()
+    results.append(('engine.clear_lines', measure(engine.clear_lines, repeat,
+                                                  lambda: engine.restore(cleared_state))))
+    return results
+
+
+def bench_frontend(module, fill, repeat, rng, *size):
+    """
+    front-end 모듈(tetris 또는 tetris2)의 draw_grid와 한 프레임을 측정하는 함수. size는 (너비, 높이) 보드 크기입니다.
+    """
+    game = module.Tetris(*size)
+    if hasattr(game, 'start_game'):
+        game.start_game()
+    fill_board(game.engine, fill, rng)
+    game.drop_speed = float('inf')  # 측정 중에는 중력을 적용하지 않음
+    name = module.__name__
+
+    def invalidate():
+        game.engine.board_version += 1
+
+    def render_due():
+        game.next_render = 0.0  # 고정 간격 루프(tetris2)에서도 매번 화면을 그리도록
+        game.full_redraw = True  # 바뀐 영역만 그리는 루프(tetris2)에서도 매번 전체를 그리도록
+    results = [(f'{name}.draw_grid', measure(game.draw_grid, repeat)),
+               (f'{name}.draw_grid_rebuild', measure(game.draw_grid, repeat, invalidate)),
+               (f'{name}.frame', measure(game.frame, repeat, render_due))]
+    return results
+
+
+def bench_startup(command, repeat):
+    """
+    command로 게임을 새 프로세스로 띄워 첫 화면을 그리고 끝날 때까지의 시간(인터프리터 시작 포함)을 repeat번 재는 함수.
+    """
+    env = dict(os.environ, **{STARTUP_ENV: '1'})
+
+    def launch():
+        subprocess.run(command, env=env, cwd=HERE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    launch()  # 디스크 캐시를 채우기 위해 한 번 먼저 실행
+    return measure(launch, repeat)
+
+
+def startup_benchmarks(repeat, dist):
+    """
+    front-end마다 소스 실행과 (있으면) 실행 파일의 시작 시간을 재고 (이름, 결과) 목록을 반환하는 함수.
+    실행 파일 결과에는 파일 크기(bundle_bytes)가 함께 들어갑니다.
+    """
+    results = []
+    for name in FRONTENDS:
+        results.append((f'startup.{name}', bench_startup([sys.executable, f'{name}.py'], repeat)))
+        exe = os.path.join(dist, name + ('.exe' if sys.platform == 'win32' else ''))
+        if os.path.isfile(exe):
+            stats = bench_startup([os.path.abspath(exe)], repeat)
+            stats['bundle_bytes'] = os.path.getsize(exe)
+            results.append((f'startup.{name}.frozen', stats))
+    return results
+
+
+def run_benchmarks(repeat, label, startup_repeat=0, dist='dist'):
+    """
+    모든 벤치마크를 실행하고 결과 사전을 반환하는 함수.
+    """
+    import pygame
+    import tetris
+    import tetris2
+
+    rng = random.Random(0)
+    results = []
+    for width, height in BOARD_SIZES:
+        size = f'{width}x{height}'
+        for fill in FILL_LEVELS:
+            measured = bench_engine(fill, repeat, rng, width, height)
+            if (width, height) == (GRID_WIDTH, GRID_HEIGHT):
+                for module in (tetris, tetris2):
+                    measured += bench_frontend(module, fill, max(1, repeat // 10), rng)
+            else:
+                # 보드 크기를 정할 수 있는 front-end는 tetris2뿐
+                measured += bench_frontend(tetris2, fill, max(1, repeat // 10), rng, width, height)
+            for name, stats in measured:
+                results.append({'name': name, 'size': size, 'fill': fill, **stats})
+                print(f"{name:32} {size:>7} fill={fill:<4} {stats['ops_per_sec']:>12.0f} ops/s "
+                      f"p50={stats['p50_us']:8.2f}us p99={stats['p99_us']:8.2f}us")
+    if startup_repeat:
+        for name, stats in startup_benchmarks(startup_repeat, dist):
+            results.append({'name': name, 'size': '-', 'fill': 0.0, **stats})
+            bundle = f" bundle={stats['bundle_bytes'] / 1e6:.1f}MB" if 'bundle_bytes' in stats else ''
+            print(f"{name:32} first frame p50={stats['p50_us'] / 1000:8.1f}ms "
+                  f"p99={stats['p99_us'] / 1000:8.1f}ms{bundle}")
+    return {
+        'label': label,
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def compare(old_path, new_path, threshold):
+    """
+    두 결과 파일을 비교하여 p50 지연 시간이 threshold 비율 이상 늘어난 항목을 출력하는 함수.
+    느려진 항목 수를 반환합니다.
+    """
+    with open(old_path) as f:
+        old = {(r['name'], r['size'], r['fill']): r for r in json.load(f)['results']}
+    with open(new_path) as f:
+        new = json.load(f)['results']
+    regressions = 0
+    for result in new:
+        before = old.get((result['name'], result['size'], result['fill']))
+        if before is None:
+            continue
+        change = result['p50_us'] / before['p50_us'] - 1 if before['p50_us'] else 0.0
+        regressed = change > threshold
+        regressions += regressed
+        print(f"{'REGRESSION' if regressed else 'ok':10} {result['name']:32} {result['size']:>7} "
+              f"fill={result['fill']:<4} p50 {before['p50_us']:8.2f} -> {result['p50_us']:8.2f}us ({change:+.1%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tetris engine/renderer benchmarks")
+    parser.add_argument('-o', '--output', default='bench_results.json')
+    parser.add_argument('--label', default='')
+    parser.add_argument('--repeat', type=int, default=2000)
+    parser.add_argument('--startup', type=int, default=10, metavar='N',
+                        help="startup (time-to-first-frame) runs per front-end, 0 to skip")
+    parser.add_argument('--dist', default=os.path.join(HERE, 'dist'),
+                        help="folder with PyInstaller builds to time and size")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'))
+    parser.add_argument('--threshold', type=float, default=0.1)
+    args = parser.parse_args()
+
+    if args.compare:
+        return 1 if compare(*args.compare, args.threshold) else 0
+    report = run_benchmarks(args.repeat, args.label, args.startup, args.dist)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,365 @@
+"""
+블록을 놓을 자리를 찾아 자동으로 게임을 하는 봇 모듈.
+현재 블록과 다음 블록(next_shape)의 모든 (회전, 열) 배치를 나열하고,
+결과 보드를 구멍 수, 높이 합, 울퉁불퉁함, 지운 줄 수로 평가합니다.
+첫 번째 블록의 후보들은 concurrent.futures 프로세스 풀에 나누어 평가하며, 한 수마다 시간 제한이 있습니다.
+보드의 Zobrist 해시를 주면 보드 특징(높이 합, 구멍 수, 울퉁불퉁함)과 배치 목록을 프로세스마다의 LRU 캐시에
+기억해 두고, 다른 순서의 수나 다른 가중치로 같은 보드에 다시 오면 계산하지 않고 꺼내 씁니다.
+보드 비트마스크와 Zobrist 키는 기본 크기(GRID_WIDTH x GRID_HEIGHT) 보드 기준이므로, 다른 크기의 엔진은 받지 않습니다.
+
+사용법: python bot.py [게임 수] [작업 프로세스 수]
+"""
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from cache import TranspositionCache
+from engine import (TetrisEngine, GRID_WIDTH, GRID_HEIGHT, FULL_ROW, ROTATIONS, SPAWN_X, LEFT, RIGHT, ROTATE, DROP,
+                    zobrist_keys, row_signature, row_hash)
+
+# 평가 가중치 (높이 합, 지운 줄 수, 구멍 수, 울퉁불퉁함)
+WEIGHTS = {'height': -0.510066, 'lines': 0.760666, 'holes': -0.35663, 'bumpiness': -0.184483}
+
+# 다음 블록을 놓을 자리가 없는 배치(게임 종료)에 주는 점수
+GAME_OVER_SCORE = -1e9
+
+# 작업 프로세스는 시간 제한보다 이만큼 먼저 멈춰, 결과가 제한 안에 돌아오게 함 (초)
+RESULT_MARGIN = 0.002
+
+# 기본 크기 보드의 Zobrist 키 (엔진의 board_hash와 같은 키)
+ZOBRIST = zobrist_keys(GRID_WIDTH, GRID_HEIGHT)
+# 보드 해시 -> 보드 특징, (보드 해시 ^ 블록 키) -> 배치 목록 캐시 (프로세스마다 하나, 가중치와 상관없음)
+CACHE_SIZE = 1 << 16
+FEATURE_CACHE = TranspositionCache(CACHE_SIZE)
+PLACEMENT_CACHE = TranspositionCache(CACHE_SIZE)
+# 줄 비트마스크 -> 줄 서명
+ROW_SIGNATURES = [row_signature(ZOBRIST, mask) for mask in range(FULL_ROW + 1)]
+# ROW_HASHES[y][줄 비트마스크] -> 그 줄이 엔진의 board_hash에 더하는 값 (놓은 뒤 해시를 바뀐 줄만으로 바로 계산하기 위해)
+ROW_HASHES = tuple(tuple(row_hash(ZOBRIST, signature, y) for signature in ROW_SIGNATURES) for y in range(GRID_HEIGHT))
+
+
+def column_heights(rows):
+    """
+    보드 줄 비트마스크로부터 열마다 쌓인 높이를 계산하는 함수.
+    """
+    heights = [0] * GRID_WIDTH
+    remaining = FULL_ROW
+    for y in range(GRID_HEIGHT):
+        found = rows[y] & remaining
+        if found:
+            remaining ^= found
+            while found:
+                bit = found & -found
+                heights[bit.bit_length() - 1] = GRID_HEIGHT - y
+                found ^= bit
+            if not remaining:
+                break
+    return heights
+
+
+def collides(rows, index, rotation, x, y):
+    """
+    보드 줄 비트마스크 위에서 블록이 충돌하는지 확인하는 함수 (TetrisEngine.collides와 같은 규칙).
+    """
+    state = ROTATIONS[index][rotation]
+    if x < 0 or x + state.width > GRID_WIDTH or y + state.height > GRID_HEIGHT:
+        return True
+    for dy, mask in enumerate(state.row_masks):
+        if rows[y + dy] & (mask << x):
+            return True
+    return False
+
+
+def placements(rows, index, rotation, x, y):
+    """
+    (rotation, x, y)에 있는 블록에서 갈 수 있는 모든 (회전 횟수, 회전 번호, 열)을 나열하는 함수.
+    제자리에서 회전한 뒤 같은 줄에서 좌우로 밀 수 있는 자리만 포함하고, 모양이 같은 회전은 한 번만 셉니다.
+    """
+    result = []
+    seen = set()
+    for turns in range(4):
+        r = (rotation + turns) & 3
+        if turns and collides(rows, index, r, x, y):
+            break
+        cells = ROTATIONS[index][r].cells
+        if cells in seen:
+            continue
+        seen.add(cells)
+        result.append((turns, r, x))
+        for step in (-1, 1):
+            column = x + step
+            while not collides(rows, index, r, column, y):
+                result.append((turns, r, column))
+                column += step
+    return result
+
+
+def landing_row(rows, heights, index, rotation, x, y):
+    """
+    (x, y)에 있는 블록을 떨어뜨렸을 때 멈추는 y 좌표를 반환하는 함수 (TetrisEngine.landing_row와 같은 규칙).
+    """
+    state = ROTATIONS[index][rotation]
+    row = GRID_HEIGHT
+    for dx, bottom in enumerate(state.bottoms):
+        r = GRID_HEIGHT - heights[x + dx] - 1 - bottom
+        if r < row:
+            row = r
+    if row < y:
+        row = y
+        while not collides(rows, index, rotation, x, row + 1):
+            row += 1
+    return row
+
+
+def place_piece(rows, index, rotation, x, row):
+    """
+    블록을 row 줄에 고정하고 가득 찬 줄을 지운 결과 (새 보드 줄, 지운 줄 수)를 반환하는 함수.
+    """
+    new_rows = list(rows)
+    for dy, mask in enumerate(ROTATIONS[index][rotation].row_masks):
+        new_rows[row + dy] |= mask << x
+    kept = [r for r in new_rows if r != FULL_ROW]
+    cleared = GRID_HEIGHT - len(kept)
+    if cleared:
+        new_rows = [0] * cleared + kept
+    return new_rows, cleared
+
+
+def drop_piece(rows, heights, index, rotation, x, y):
+    """
+    블록을 떨어뜨려 고정하고 가득 찬 줄을 지운 결과 (새 보드 줄, 지운 줄 수)를 반환하는 함수.
+    """
+    return place_piece(rows, index, rotation, x, landing_row(rows, heights, index, rotation, x, y))
+
+
+def placed_hash(board_hash, rows, new_rows, cleared, index, rotation, row):
+    """
+    rows에 블록을 놓은 뒤 보드(new_rows)의 Zobrist 해시를 반환하는 함수.
+    줄을 지우지 않았으면 블록이 닿은 줄의 값만 바꾸고, 지웠으면 모든 줄의 값을 표에서 꺼내 XOR합니다.
+    """
+    if cleared:
+        value = 0
+        for y, mask in enumerate(new_rows):
+            value ^= ROW_HASHES[y][mask]
+        return value
+    for y in range(row, row + ROTATIONS[index][rotation].height):
+        board_hash ^= ROW_HASHES[y][rows[y]] ^ ROW_HASHES[y][new_rows[y]]
+    return board_hash
+
+
+def board_features(rows):
+    """
+    보드의 (높이 합, 구멍 수, 울퉁불퉁함)을 계산하는 함수. 가중치와 상관없으므로 보드 해시로 캐시할 수 있습니다.
+    """
+    heights = column_heights(rows)
+    bumpiness = sum(abs(heights[x] - heights[x + 1]) for x in range(GRID_WIDTH - 1))
+    holes = 0
+    covered = 0  # 위에 블록이 있는 열
+    for row in rows:
+        holes += (covered & ~row).bit_count()
+        covered |= row
+    return sum(heights), holes, bumpiness
+
+
+def weigh(features, lines, weights):
+    """
+    보드 특징과 지운 줄 수에 가중치를 곱해 더한 점수를 반환하는 함수.
+    """
+    height, holes, bumpiness = features
+    return (weights['height'] * height + weights['lines'] * lines +
+            weights['holes'] * holes + weights['bumpiness'] * bumpiness)
+
+
+def evaluate(rows, lines, weights):
+    """
+    보드를 높이 합, 지운 줄 수, 구멍 수, 울퉁불퉁함으로 평가하는 함수. 클수록 좋은 보드입니다.
+    """
+    return weigh(board_features(rows), lines, weights)
+
+
+def cached_placements(rows, board_hash, index, rotation, x, y):
+    """
+    placements()의 결과(갈 수 있는 배치 목록)를 보드 해시와 블록 키로 PLACEMENT_CACHE에 기억해 두는 함수.
+    """
+    key = board_hash ^ ZOBRIST.pieces[index * 4 + rotation] ^ ZOBRIST.xs[x] ^ ZOBRIST.ys[y]
+    result = PLACEMENT_CACHE.get(key)
+    if result is None:
+        # 정수만 담은 튜플은 가비지 컬렉터가 따라다니지 않으므로 캐시가 커져도 GC 비용이 늘지 않음
+        result = tuple(placements(rows, index, rotation, x, y))
+        PLACEMENT_CACHE.put(key, result)
+    return result
+
+
+def best_single(rows, index, rotation, x, y, lines, weights, board_hash=None):
+    """
+    블록 하나만 보고 가장 좋은 배치의 (점수, 회전 횟수, 열)을 반환하는 함수. 놓을 자리가 없으면 None.
+    board_hash(rows의 Zobrist 해시)를 주면 배치 목록과 놓은 뒤 보드의 특징에 캐시를 씁니다.
+    """
+    if board_hash is None:
+        candidates = placements(rows, index, rotation, x, y)
+    else:
+        candidates = cached_placements(rows, board_hash, index, rotation, x, y)
+    heights = column_heights(rows)
+    best = None
+    for turns, r, column in candidates:
+        row = landing_row(rows, heights, index, r, column, y)
+        new_rows, cleared = place_piece(rows, index, r, column, row)
+        if board_hash is None or cleared:
+            # 줄을 지운 보드는 해시를 처음부터 계산해야 하므로 캐시하지 않음 (다시 만날 일도 드묾)
+            features = board_features(new_rows)
+        else:
+            new_hash = placed_hash(board_hash, rows, new_rows, 0, index, r, row)
+            features = FEATURE_CACHE.get(new_hash)
+            if features is None:
+                features = board_features(new_rows)
+                FEATURE_CACHE.put(new_hash, features)
+        score = weigh(features, lines + cleared, weights)
+        if best is None or score > best[0]:
+            best = (score, turns, column)
+    return best
+
+
+def search_chunk(rows, heights, candidates, index, y, next_index, weights, board_hash=None, deadline=None):
+    """
+    첫 번째 블록 후보 일부를 평가하는 함수 (프로세스 풀 작업 단위).
+    후보마다 블록을 놓은 뒤 다음 블록의 가장 좋은 배치로 점수를 매기고, 그중 가장 좋은 (점수, 회전 횟수, 열)을 반환합니다.
+    board_hash를 주면 놓은 뒤 보드의 해시를 이어서 계산해 다음 블록 평가에 캐시를 씁니다.
+    deadline(time.monotonic() 시각)이 지나면 남은 후보를 보지 않고 None을 반환합니다 (일부 후보만 본 결과는 쓰지 않음).
+    이미 돌고 있는 작업은 Future.cancel()로 멈출 수 없으므로, 시간이 지난 작업이 풀을 계속 붙잡지 않게 스스로 멈춥니다.
+    """
+    best = None
+    next_x = SPAWN_X[next_index]
+    for turns, r, column in candidates:
+        row = landing_row(rows, heights, index, r, column, y)
+        new_rows, cleared = place_piece(rows, index, r, column, row)
+        new_hash = None if board_hash is None else placed_hash(board_hash, rows, new_rows, cleared, index, r, row)
+        if collides(new_rows, next_index, 0, next_x, 0):
+            score = GAME_OVER_SCORE + evaluate(new_rows, cleared, weights)
+        else:
+            score = best_single(new_rows, next_index, 0, next_x, 0, cleared, weights, new_hash)[0]
+        if best is None or score > best[0]:
+            best = (score, turns, column)
+        if deadline is not None and time.monotonic() >= deadline:
+            return None
+    return best
+
+
+class PlacementBot:
+    """
+    현재 블록과 다음 블록을 내다보고 배치를 고르는 봇.
+    workers가 1보다 크면 프로세스 풀에 후보를 나누어 평가하고, time_budget(초) 안에 끝난 결과 중 가장 좋은 것을 고릅니다.
+    workers가 1이면 같은 프로세스에서 모든 후보를 평가하되, time_budget이 지나면 멈추고 현재 블록만 본 배치를 씁니다
+    (이때는 그 배치를 시간이 지난 뒤에 구하므로 블록 하나를 평가하는 시간만큼 늦어질 수 있습니다).
+    작업 프로세스는 시간 제한이 되면 맡은 후보를 끝까지 보지 않고 멈추므로, 늦은 작업이 다음 수의 작업을 밀어내지 않습니다.
+    일부 작업만 끝났으면 그 작업들이 본 후보 중에서 고르고, 제한 안에 끝난 작업이 하나도 없으면 다음 블록을 보지 않고 현재 블록만 본 배치(best_single)를 쓰며,
+    이렇게 대신 고른 횟수를 fallbacks에 셉니다.
+    use_cache가 참이면 엔진의 board_hash로 프로세스마다의 캐시(FEATURE_CACHE, PLACEMENT_CACHE)를 씁니다.
+    한 게임 안에서는 같은 보드를 다시 만나는 경우가 5% 정도라 캐시 비용이 더 크므로 기본값은 꺼져 있고,
+    같은 보드를 여러 번 보는 경우(같은 seed 게임을 여러 가중치로 돌리는 tune.py, 리플레이 분석)에 켭니다.
+    """
+    def __init__(self, weights=WEIGHTS, workers=None, time_budget=0.1, use_cache=False):
+        self.weights = weights
+        self.time_budget = time_budget
+        self.use_cache = use_cache
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+        self.fallbacks = 0      # 시간 안에 두 블록 탐색 결과가 없어 현재 블록만 보고 고른 횟수
+
+    def close(self):
+        """
+        프로세스 풀을 정리하는 함수.
+        """
+        if self.pool:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    def choose(self, engine):
+        """
+        엔진의 현재 블록을 놓을 (회전 횟수, 열)을 고르는 함수. 놓을 자리가 없으면 None을 반환합니다.
+        기본 크기가 아닌 보드의 엔진이면 ValueError를 냅니다.
+        """
+        if (engine.width, engine.height) != (GRID_WIDTH, GRID_HEIGHT):
+            raise ValueError(f"PlacementBot only supports {GRID_WIDTH}x{GRID_HEIGHT} boards, "
+                             f"not {engine.width}x{engine.height}")
+        piece = engine.current_shape
+        next_index = engine.next_shape.index
+        rows = list(engine.rows)
+        board_hash = engine.board_hash if self.use_cache else None
+        if board_hash is None:
+            candidates = placements(rows, piece.index, piece.rotation, piece.x, piece.y)
+        else:
+            candidates = cached_placements(rows, board_hash, piece.index, piece.rotation, piece.x, piece.y)
+        if not candidates:
+            return None
+
+        args = (rows, list(engine.heights))
+        deadline = time.monotonic() + self.time_budget
+        if self.pool is None:
+            best = search_chunk(*args, candidates, piece.index, piece.y, next_index, self.weights, board_hash, deadline)
+            if best is None:
+                self.fallbacks += 1
+                best = best_single(rows, piece.index, piece.rotation, piece.x, piece.y, 0, self.weights, board_hash)
+            return best[1], best[2]
+
+        futures = [self.pool.submit(search_chunk, *args, candidates[i::self.workers], piece.index, piece.y,
+                                    next_index, self.weights, board_hash, deadline - RESULT_MARGIN)
+                   for i in range(min(self.workers, len(candidates)))]
+        # 작업 프로세스가 도는 동안, 시간 안에 끝나지 않을 때를 대비해 블록 하나만 본 결과를 구해 둠
+        fallback = best_single(rows, piece.index, piece.rotation, piece.x, piece.y, 0, self.weights, board_hash)
+        done, not_done = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+        for future in not_done:
+            future.cancel()     # 아직 시작하지 않은 작업만 취소됨 (돌고 있는 작업은 deadline에 스스로 멈춤)
+        results = [result for result in (future.result() for future in done) if result is not None]
+        if not results:
+            self.fallbacks += 1
+            return fallback[1], fallback[2]
+        best = max(results)
+        return best[1], best[2]
+
+    def play_move(self, engine):
+        """
+        고른 배치대로 엔진에 액션을 넣고 블록을 떨어뜨리는 함수. 놓을 자리가 없으면 False를 반환합니다.
+        """
+        choice = self.choose(engine)
+        if choice is None:
+            return False
+        for action in placement_actions(engine.current_shape, *choice):
+            engine.step(action)
+        return True
+
+
+def placement_actions(piece, turns, column):
+    """
+    블록을 (회전 횟수, 열) 배치로 보내는 액션 목록을 만드는 함수.
+    """
+    actions = [ROTATE] * turns
+    if column < piece.x:
+        actions += [LEFT] * (piece.x - column)
+    else:
+        actions += [RIGHT] * (column - piece.x)
+    actions.append(DROP)
+    return actions
+
+
+def soak_test(games, workers=None, seed=0, max_pieces=10000):
+    """
+    봇으로 게임을 여러 판(판마다 최대 max_pieces개 블록) 진행하고 결과를 출력하는 함수.
+    """
+    bot = PlacementBot(workers=workers)
+    try:
+        for game in range(games):
+            engine = TetrisEngine(seed=seed + game)
+            start = time.perf_counter()
+            while not engine.game_over and engine.pieces < max_pieces and bot.play_move(engine):
+                pass
+            elapsed = time.perf_counter() - start
+            print(f"game {game}: pieces={engine.pieces} lines={engine.lines} score={engine.score} "
+                  f"({engine.pieces / elapsed:.0f} pieces/s)")
+    finally:
+        bot.close()
+
+
+if __name__ == "__main__":
+    soak_test(int(sys.argv[1]) if len(sys.argv) > 1 else 1,
+              int(sys.argv[2]) if len(sys.argv) > 2 else None)
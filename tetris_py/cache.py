@@ -0,0 +1,58 @@
+"""
+크기가 제한된 LRU 캐시 모듈.
+엔진의 Zobrist 해시(TetrisEngine.board_hash)를 키에 넣어, 다른 순서의 수로 다시 만난 보드의
+평가나 배치 목록 같은 계산 결과를 다시 쓰는 데(transposition table) 씁니다.
+"""
+from collections import OrderedDict
+
+
+class TranspositionCache:
+    """
+    가장 오래 쓰지 않은 항목부터 버리는 캐시. 항목 수는 maxsize를 넘지 않습니다.
+    """
+    def __init__(self, maxsize=1 << 16):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.data)
+
+    def get(self, key, default=None):
+        """
+        key의 값을 반환하는 함수. 없으면 default를 반환합니다.
+        """
+        data = self.data
+        try:
+            value = data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        key에 value를 넣는 함수. 가득 차면 가장 오래 쓰지 않은 항목을 버립니다.
+        """
+        data = self.data
+        data[key] = value
+        data.move_to_end(key)
+        if len(data) > self.maxsize:
+            data.popitem(last=False)
+
+    def clear(self):
+        """
+        모든 항목과 적중 횟수를 지우는 함수.
+        """
+        self.data.clear()
+        self.hits = self.misses = 0
+
+    def hit_rate(self):
+        """
+        지금까지 get()이 값을 찾은 비율을 반환하는 함수.
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
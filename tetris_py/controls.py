@@ -0,0 +1,68 @@
+"""
+키보드 입력 처리 모듈.
+KEYDOWN/KEYUP 이벤트로 키 상태를 관리하고, 누른 순간 바로 한 번 동작한 뒤
+DAS(처음 반복까지의 지연) 후 ARR 간격으로 자동 반복합니다. 시간은 게임 로직의 시뮬레이션 시간(밀리초)을 씁니다.
+"""
+from engine import LEFT, RIGHT, DOWN, ROTATE, DROP
+
+
+class KeyRepeat:
+    """
+    키별 자동 반복(DAS/ARR)을 관리하는 클래스.
+    bindings는 키 -> 액션, repeat_actions는 누르고 있으면 반복되는 액션 집합입니다.
+    """
+    def __init__(self, bindings, repeat_actions=(LEFT, RIGHT, DOWN), das=150, arr=50):
+        self.bindings = bindings
+        self.repeat_actions = set(repeat_actions)
+        self.das = das          # 처음 누른 뒤 반복이 시작될 때까지의 시간 (밀리초)
+        self.arr = arr          # 반복 간격 (밀리초)
+        self.held = {}          # 누르고 있는 키 -> 다음 반복 시각
+
+    def clear(self):
+        """
+        누르고 있는 키 상태를 모두 지우는 함수.
+        """
+        self.held.clear()
+
+    def press(self, key, now):
+        """
+        키가 눌렸을 때 부르는 함수. 바로 실행할 액션(없으면 None)을 반환합니다.
+        """
+        action = self.bindings.get(key)
+        if action is None:
+            return None
+        if action in self.repeat_actions:
+            self.held[key] = now + self.das
+        return action
+
+    def release(self, key):
+        """
+        키를 뗐을 때 부르는 함수.
+        """
+        self.held.pop(key, None)
+
+    def update(self, now):
+        """
+        now 시각까지 반복되어야 할 액션 목록을 반환하는 함수.
+        """
+        actions = []
+        for key, due in self.held.items():
+            action = self.bindings[key]
+            while due <= now:
+                actions.append(action)
+                due += self.arr
+            self.held[key] = due
+        return actions
+
+
+def default_bindings(pygame):
+    """
+    방향키/스페이스바 기본 키 배치를 만드는 함수.
+    """
+    return {
+        pygame.K_LEFT: LEFT,
+        pygame.K_RIGHT: RIGHT,
+        pygame.K_DOWN: DOWN,
+        pygame.K_UP: ROTATE,
+        pygame.K_SPACE: DROP,
+    }
@@ -0,0 +1,542 @@
+"""
+테트리스 게임 규칙만 담은 엔진 모듈.
+pygame, 렌더링, 시간, 입출력에 전혀 의존하지 않으므로 봇, 회귀 테스트, 분석용 시뮬레이션을 최대 속도로 돌릴 수 있습니다.
+tetris.py 와 tetris2.py 의 화면(front-end)은 모두 이 엔진을 구동합니다.
+"""
+import random
+from collections import deque, namedtuple
+from functools import lru_cache
+
+# 게임 그리드 크기
+GRID_WIDTH = 10
+GRID_HEIGHT = 20
+
+# 빈 칸을 나타내는 블록 번호 (블록 번호는 1부터 시작)
+EMPTY = 0
+
+# 한 줄이 가득 찼을 때의 비트마스크 (x번째 칸 = x번째 비트)
+FULL_ROW = (1 << GRID_WIDTH) - 1
+
+# Shapes
+SHAPES = [
+    [[1, 1, 1, 1]],  # I
+    [[1, 1], [1, 1]],  # O
+    [[0, 1, 0], [1, 1, 1]],  # T
+    [[1, 0, 0], [1, 1, 1]],  # L
+    [[0, 0, 1], [1, 1, 1]],  # J
+    [[0, 1, 1], [1, 1, 0]],  # S
+    [[1, 1, 0], [0, 1, 1]]   # Z
+]
+
+
+def rotate_cells(shape):
+    """
+    블록 모양을 한 번 회전시킨 새 모양을 반환하는 함수 (기존 rotate_shape와 같은 방향).
+    """
+    return [[shape[y][x] for y in range(len(shape))] for x in range(len(shape[0]) - 1, -1, -1)]
+
+
+# 회전 상태 하나에 대해 미리 계산해 둔 값
+#   shape: 그리기용 0/1 튜플, cells: 채워진 칸의 (dx, dy) 목록,
+#   width/height: 경계 상자 크기, row_masks: 줄마다의 비트마스크 (x = 0 기준),
+#   tops/bottoms: 열마다 가장 위/아래에 있는 칸의 dy
+Rotation = namedtuple('Rotation', 'shape cells width height row_masks tops bottoms')
+
+
+def build_rotations(shape):
+    """
+    블록 모양 하나의 네 가지 회전 상태를 계산하는 함수.
+    """
+    rotations = []
+    for _ in range(4):
+        cells = tuple((x, y) for y, row in enumerate(shape) for x, cell in enumerate(row) if cell)
+        row_masks = tuple(sum(1 << x for x, cell in enumerate(row) if cell) for row in shape)
+        columns = [[y for x, y in cells if x == column] for column in range(len(shape[0]))]
+        tops = tuple(min(ys) for ys in columns)
+        bottoms = tuple(max(ys) for ys in columns)
+        rotations.append(Rotation(tuple(tuple(row) for row in shape), cells, len(shape[0]), len(shape),
+                                  row_masks, tops, bottoms))
+        shape = rotate_cells(shape)
+    return tuple(rotations)
+
+
+# ROTATIONS[블록 인덱스][회전 번호] -> Rotation. 모듈을 불러올 때 한 번만 계산합니다.
+ROTATIONS = tuple(build_rotations(shape) for shape in SHAPES)
+
+
+def spawn_columns(width):
+    """
+    너비가 width인 보드에서 블록마다 처음 나타나는 x 좌표(위쪽 가운데)를 계산하는 함수.
+    """
+    return tuple(width // 2 - rotations[0].width // 2 for rotations in ROTATIONS)
+
+
+# 기본 크기 보드에서 블록이 처음 나타나는 x 좌표
+SPAWN_X = spawn_columns(GRID_WIDTH)
+
+# Zobrist 해시 키를 만드는 난수 seed (프로세스와 실행이 달라도 같은 상태는 같은 해시)
+ZOBRIST_SEED = 0x7E7215
+MASK64 = (1 << 64) - 1
+
+# 보드 크기 하나에 대한 Zobrist 키 (모두 64비트)
+#   columns: 열마다 (줄 서명을 만드는 키), rows: 줄마다 (줄 서명을 줄 위치와 섞는 키),
+#   pieces: (블록 인덱스 * 4 + 회전)마다, xs/ys: 떨어지는 블록의 위치마다, nexts: 다음 블록 인덱스마다
+Zobrist = namedtuple('Zobrist', 'columns rows pieces xs ys nexts')
+
+
+def splitmix64(value):
+    """
+    64비트 정수를 고르게 섞는 함수 (splitmix64). 입력이 다르면 출력도 다릅니다.
+    """
+    value = (value + 0x9E3779B97F4A7C15) & MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+
+@lru_cache(maxsize=16)
+def zobrist_keys(width, height):
+    """
+    width x height 보드의 Zobrist 키를 만드는 함수. 최근 쓴 보드 크기 16개까지 기억해 두고 다시 씁니다.
+    키는 칸마다가 아니라 열마다, 줄마다 만들므로 너비 + 높이에 비례하는 만큼만 듭니다.
+    """
+    rng = random.Random(ZOBRIST_SEED)
+
+    def keys(count):
+        return [rng.getrandbits(64) for _ in range(count)]
+    return Zobrist(keys(width), keys(height), keys(len(SHAPES) * 4), keys(width), keys(height), keys(len(SHAPES)))
+
+
+def row_signature(zobrist, mask):
+    """
+    줄 비트마스크 mask에서 채워진 열들의 키를 XOR한 줄 서명을 반환하는 함수. 빈 줄은 0입니다.
+    """
+    columns = zobrist.columns
+    value = 0
+    while mask:
+        bit = mask & -mask
+        value ^= columns[bit.bit_length() - 1]
+        mask ^= bit
+    return value
+
+
+def row_hash(zobrist, signature, y):
+    """
+    y 줄에 있는 줄 서명 signature가 보드 해시에 더하는 값을 반환하는 함수. 빈 줄(서명 0)은 0입니다.
+    서명을 줄 키와 섞으므로 같은 줄이 다른 높이에 있으면 다른 값이 되고, 줄을 옮길 때는 옮긴 줄만 다시 계산합니다.
+    """
+    return splitmix64(signature ^ zobrist.rows[y]) if signature else 0
+
+
+def rows_hash(zobrist, signatures, top=0, bottom=None):
+    """
+    줄 서명 목록 signatures의 top ~ bottom-1 줄이 보드 해시에 더하는 값을 XOR한 값을 반환하는 함수.
+    """
+    keys = zobrist.rows
+    value = 0
+    for y in range(top, len(signatures) if bottom is None else bottom):
+        signature = signatures[y]
+        if signature:
+            # row_hash()와 같은 계산 (줄을 옮길 때 줄마다 부르므로 함수 호출 없이 풀어 씀)
+            mixed = ((signature ^ keys[y]) + 0x9E3779B97F4A7C15) & MASK64
+            mixed = ((mixed ^ (mixed >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+            mixed = ((mixed ^ (mixed >> 27)) * 0x94D049BB133111EB) & MASK64
+            value ^= mixed ^ (mixed >> 31)
+    return value
+
+
+class Piece(namedtuple('Piece', 'index rotation x y')):
+    """
+    떨어지는 블록을 나타내는 불변 타입. 블록 인덱스, 회전 번호, 위치만 가지며
+    모양 정보는 ROTATIONS 표에서 찾습니다.
+    """
+    __slots__ = ()
+
+    @property
+    def id(self):
+        """그리드에 기록될 블록 번호."""
+        return self.index + 1
+
+    @property
+    def state(self):
+        """현재 회전 상태의 미리 계산된 값."""
+        return ROTATIONS[self.index][self.rotation]
+
+    @property
+    def shape(self):
+        return ROTATIONS[self.index][self.rotation].shape
+
+    @property
+    def cells(self):
+        return ROTATIONS[self.index][self.rotation].cells
+
+
+# 한 번에 지운 줄 수에 따른 점수 (tetris2.py 방식)
+LINE_SCORES = {1: 100, 2: 300, 3: 500, 4: 800}
+
+# step()에 넘기는 액션
+NOOP, LEFT, RIGHT, DOWN, ROTATE, DROP = range(6)
+
+# push_undo()로 보관하는 되돌리기 기록의 최대 개수
+UNDO_LIMIT = 100
+
+# 고정된 보드와 난수 상태 (board_version이 바뀔 때만 새로 만들고, 그 사이의 스냅샷들은 같은 객체를 공유)
+Board = namedtuple('Board', 'rows cells heights signatures seed rng_state hash')
+
+# 게임 상태 전체의 불변 스냅샷. 블록 이동만 있었던 스냅샷끼리는 board를 공유하므로 만드는 비용이 O(1)입니다.
+Snapshot = namedtuple('Snapshot', 'board score lines last_cleared pieces ticks game_over current_shape next_shape')
+
+
+class TetrisEngine:
+    """
+    테트리스 게임 규칙(이동, 회전, 충돌, 고정, 줄 제거)을 관리하는 클래스.
+    보드는 두 가지로 저장됩니다.
+      - rows: 줄마다 정수 하나로 된 점유 비트마스크. 충돌 검사와 가득 찬 줄 검사는 비트 연산으로 합니다.
+      - cells: 칸마다 블록 번호(EMPTY 또는 SHAPES 인덱스 + 1)를 담은 bytearray. 색상 변환은 화면 쪽에서 그릴 때만 합니다.
+    그리고 heights에 열마다 쌓인 높이(바닥부터 가장 위 블록까지)를 유지하여 블록이 떨어질 위치를 바로 계산합니다.
+    블록 순서는 게임마다 seed로 만든 난수 생성기에서 뽑으므로, 같은 seed와 같은 입력이면 같은 게임이 재현됩니다.
+    보드 크기(width, height)는 인스턴스마다 정할 수 있으며, 블록 고정과 줄 제거는 블록이 닿은 줄과 쌓인 부분만 다루므로
+    수천 줄짜리 보드에서도 보드 크기에 비례하는 비용이 들지 않습니다.
+    상태마다 64비트 Zobrist 해시를 함께 유지합니다. board_hash는 채워진 칸만(블록 색은 제외),
+    hash는 여기에 떨어지는 블록(종류, 회전, 위치)과 다음 블록을 더한 값이며, 이동/고정/줄 제거 때 바뀐 부분만 XOR합니다.
+    보드 해시는 줄마다의 서명(signatures, 채워진 열 키의 XOR)을 줄 위치와 섞어 XOR한 값이므로,
+    블록 고정은 블록이 닿은 줄만, 줄 제거는 옮겨진 줄만 다시 계산합니다.
+    점수와 카운터는 해시에 들어가지 않으므로, 같은 해시는 "같은 보드에 같은 블록"이라는 뜻입니다.
+    """
+    def __init__(self, line_scores=LINE_SCORES, seed=None, undo_limit=UNDO_LIMIT, width=GRID_WIDTH, height=GRID_HEIGHT):
+        self.line_scores = line_scores  # 지운 줄 수 -> 점수 표
+        self.width = width
+        self.height = height
+        self.full_row = (1 << width) - 1            # 가득 찬 줄의 비트마스크
+        self.spawn_x = spawn_columns(width)
+        self.zobrist = zobrist_keys(width, height)
+        self.board_version = 0          # 고정된 보드가 바뀔 때마다 증가 (렌더러, 스냅샷 캐시용)
+        self.history = deque(maxlen=undo_limit)  # push_undo()로 쌓은 스냅샷
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """
+        그리드, 점수, 블록을 초기화하여 새 게임을 준비하는 함수.
+        seed가 없으면 새 seed를 뽑아 self.seed에 기록합니다.
+        """
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.rng = random.Random(self.seed)
+        self.rows = [0] * self.height
+        self.cells = bytearray(self.width * self.height)
+        self.heights = [0] * self.width
+        self.signatures = [0] * self.height     # 줄마다의 서명 (row_signature())
+        self.score = 0
+        self.lines = 0          # 지금까지 지운 전체 줄 수
+        self.last_cleared = 0   # 마지막으로 고정된 블록이 지운 줄 수
+        self.pieces = 0         # 지금까지 고정된 블록 수
+        self.ticks = 0          # 지금까지 적용된 중력 횟수
+        self.board_version += 1
+        self.game_over = False
+        self.current_shape = self.get_new_shape()
+        self.next_shape = self.get_new_shape()
+        self.board_hash = 0             # 빈 보드
+        self.rehash_pieces()
+        self.board = None               # 지금 보드의 Board (스냅샷을 만들 때 채움)
+        self.board_key = None           # self.board를 만들 때의 board_version
+        self.history.clear()
+
+    def get_new_shape(self):
+        """
+        랜덤한 블록을 그리드 위쪽 가운데에 만들어 반환하는 함수.
+        """
+        shape_index = self.rng.randint(0, len(SHAPES) - 1)  # 블록 모양을 랜덤으로 선택
+        return Piece(shape_index, 0, self.spawn_x[shape_index], 0)
+
+    def checkpoint(self):
+        """
+        현재 게임 상태 전체의 불변 스냅샷(Snapshot)을 반환하는 함수. restore()로 되돌릴 수 있습니다.
+        보드와 난수 상태(Board)는 board_version이 바뀐 뒤 처음 부를 때만 복사하고, 그 전까지는 같은 객체를 함께 씁니다.
+        난수는 블록을 고정할 때(board_version이 바뀔 때)만 뽑으므로 Board에 함께 넣어도 됩니다.
+        """
+        board = self.board
+        if board is None or self.board_version != self.board_key:
+            board = self.board = Board(tuple(self.rows), bytes(self.cells), tuple(self.heights),
+                                       tuple(self.signatures), self.seed, self.rng.getstate(), self.board_hash)
+            self.board_key = self.board_version
+        return Snapshot(board, self.score, self.lines, self.last_cleared, self.pieces, self.ticks,
+                        self.game_over, self.current_shape, self.next_shape)
+
+    def restore(self, snapshot):
+        """
+        checkpoint()로 만든 상태로 게임을 되돌리는 함수.
+        지금 보드가 스냅샷의 보드와 같은 객체이면(그 사이 블록이 고정되지 않았으면) 보드는 복사하지 않습니다.
+        """
+        (board, self.score, self.lines, self.last_cleared, self.pieces, self.ticks,
+         self.game_over, self.current_shape, self.next_shape) = snapshot
+        if board is self.board and self.board_version == self.board_key:
+            self.rehash_pieces()
+            return
+        self.board_hash = board.hash
+        self.rehash_pieces()
+        self.rows = list(board.rows)
+        self.cells = bytearray(board.cells)
+        self.heights = list(board.heights)
+        self.signatures = list(board.signatures)
+        self.seed = board.seed
+        self.rng = random.Random()
+        self.rng.setstate(board.rng_state)
+        self.board_version += 1
+        self.board = board
+        self.board_key = self.board_version
+
+    def piece_key(self, piece):
+        """
+        떨어지는 블록(종류, 회전, 위치)의 Zobrist 키를 반환하는 함수.
+        """
+        zobrist = self.zobrist
+        return zobrist.pieces[piece.index * 4 + piece.rotation] ^ zobrist.xs[piece.x] ^ zobrist.ys[piece.y]
+
+    def rehash_pieces(self):
+        """
+        board_hash에 현재 블록과 다음 블록의 키를 더해 hash를 다시 계산하는 함수.
+        """
+        self.hash = self.board_hash ^ self.piece_key(self.current_shape) ^ self.zobrist.nexts[self.next_shape.index]
+
+    def rehash(self):
+        """
+        rows를 직접 바꾼 뒤(테스트, 벤치마크) 보드 해시를 처음부터 다시 계산하는 함수.
+        """
+        self.signatures = [row_signature(self.zobrist, mask) for mask in self.rows]
+        self.board_hash = rows_hash(self.zobrist, self.signatures)
+        self.rehash_pieces()
+
+    def push_undo(self):
+        """
+        지금 상태를 되돌리기 기록에 넣는 함수. 기록이 undo_limit개를 넘으면 가장 오래된 것부터 버립니다.
+        """
+        self.history.append(self.checkpoint())
+
+    def undo(self):
+        """
+        마지막으로 push_undo()한 상태로 되돌리는 함수. 기록이 없으면 False를 반환합니다.
+        """
+        if not self.history:
+            return False
+        self.restore(self.history.pop())
+        return True
+
+    def cell(self, x, y):
+        """
+        (x, y) 칸의 블록 번호를 반환하는 함수.
+        """
+        return self.cells[y * self.width + x]
+
+    def step(self, action):
+        """
+        액션 하나를 적용하는 함수. 블록이 움직였거나 고정되었으면 True를 반환합니다.
+        """
+        if self.game_over:
+            return False
+        if action == LEFT:
+            return self.move_shape(-1, 0)
+        if action == RIGHT:
+            return self.move_shape(1, 0)
+        if action == DOWN:
+            return self.move_shape(0, 1)
+        if action == ROTATE:
+            return self.rotate_shape()
+        if action == DROP:
+            self.hard_drop()
+            return True
+        return False
+
+    def tick(self):
+        """
+        중력 한 번을 적용하는 함수. 블록을 한 칸 내리고, 내려갈 수 없으면 고정합니다.
+        블록이 고정되었으면 True를 반환합니다.
+        """
+        if self.game_over:
+            return False
+        self.ticks += 1
+        if not self.move_shape(0, 1):
+            self.lock_shape()
+            return True
+        return False
+
+    def move_shape(self, dx, dy):
+        """
+        블록을 x축(dx)과 y축(dy)으로 이동시키는 함수.
+        """
+        piece = self.current_shape
+        if self.collides(piece.index, piece.rotation, piece.x + dx, piece.y + dy):
+            return False
+        moved = self.current_shape = Piece(piece.index, piece.rotation, piece.x + dx, piece.y + dy)
+        self.hash ^= self.piece_key(piece) ^ self.piece_key(moved)
+        return True
+
+    def rotate_shape(self):
+        """
+        현재 블록을 회전시키는 함수. 회전에 성공하면 True를 반환합니다.
+        """
+        piece = self.current_shape
+        rotation = (piece.rotation + 1) & 3
+        if self.collides(piece.index, rotation, piece.x, piece.y):
+            return False
+        rotated = self.current_shape = Piece(piece.index, rotation, piece.x, piece.y)
+        self.hash ^= self.piece_key(piece) ^ self.piece_key(rotated)
+        return True
+
+    def hard_drop(self):
+        """
+        블록을 바닥까지 즉시 떨어뜨리고 고정하는 함수.
+        """
+        piece = self.current_shape
+        self.current_shape = Piece(piece.index, piece.rotation, piece.x,
+                                   self.landing_row(piece.index, piece.rotation, piece.x, piece.y))
+        self.lock_shape()
+
+    def landing_row(self, index, rotation, x, y=0):
+        """
+        (x, y)에 있는 블록을 떨어뜨렸을 때 멈추는 y 좌표를 반환하는 함수.
+        블록이 모든 열에서 쌓인 블록보다 위에 있으면 열 높이로 바로 계산하고,
+        튀어나온 블록 아래에 들어가 있는 경우에만 한 칸씩 충돌을 확인합니다.
+        """
+        state = ROTATIONS[index][rotation]
+        heights = self.heights
+        height = self.height
+        row = height
+        for dx, bottom in enumerate(state.bottoms):
+            r = height - heights[x + dx] - 1 - bottom
+            if r < row:
+                row = r
+        if row < y:
+            row = y
+            while not self.collides(index, rotation, x, row + 1):
+                row += 1
+        return row
+
+    def ghost_piece(self):
+        """
+        현재 블록이 떨어질 위치에 놓인 블록(고스트 블록)을 반환하는 함수.
+        """
+        piece = self.current_shape
+        return Piece(piece.index, piece.rotation, piece.x,
+                     self.landing_row(piece.index, piece.rotation, piece.x, piece.y))
+
+    def check_collision(self, piece=None):
+        """
+        블록(기본값은 현재 블록)이 그리드 경계나 다른 블록과 충돌하는지 확인하는 함수.
+        """
+        if piece is None:
+            piece = self.current_shape
+        return self.collides(piece.index, piece.rotation, piece.x, piece.y)
+
+    def collides(self, index, rotation, x, y):
+        """
+        주어진 블록 인덱스, 회전, 위치가 충돌하는지 확인하는 함수.
+        미리 계산된 줄 비트마스크를 보드 줄과 AND 연산하므로 새 객체를 만들지 않습니다.
+        """
+        state = ROTATIONS[index][rotation]
+        if x < 0 or x + state.width > self.width or y + state.height > self.height:
+            return True
+        rows = self.rows
+        for dy, mask in enumerate(state.row_masks):
+            if rows[y + dy] & (mask << x):
+                return True
+        return False
+
+    def lock_shape(self):
+        """
+        현재 블록을 그리드에 고정하고 새로운 블록을 생성하는 함수.
+        """
+        piece = self.current_shape
+        px = piece.x
+        py = piece.y
+        piece_id = piece.index + 1
+        rows = self.rows
+        signatures = self.signatures
+        zobrist = self.zobrist
+        board_hash = self.board_hash
+        for dy, mask in enumerate(piece.state.row_masks):
+            y = py + dy
+            signature = signatures[y]
+            signatures[y] = signature ^ row_signature(zobrist, (mask << px) & ~rows[y])
+            rows[y] |= mask << px
+            board_hash ^= row_hash(zobrist, signature, y) ^ row_hash(zobrist, signatures[y], y)
+        self.board_hash = board_hash
+        cells = self.cells
+        width = self.width
+        for dx, dy in piece.cells:
+            cells[(py + dy) * width + px + dx] = piece_id
+        heights = self.heights
+        for dx, top in enumerate(piece.state.tops):
+            height = self.height - py - top
+            if height > heights[px + dx]:
+                heights[px + dx] = height
+        self.pieces += 1
+        self.board_version += 1
+        self.clear_lines(range(py, py + piece.state.height))
+        self.current_shape = self.next_shape
+        self.next_shape = self.get_new_shape()
+        self.rehash_pieces()
+        if self.check_collision():
+            self.game_over = True
+
+    def clear_lines(self, candidates=None):
+        """
+        가득 찬 라인을 지우고 점수를 추가하는 함수. 지운 줄 수를 반환합니다.
+        candidates는 가득 찼을 수 있는 줄(방금 고정된 블록이 닿은 줄)이며, 없으면 쌓인 부분 전체를 확인합니다.
+        줄을 지울 때는 쌓인 부분의 맨 위부터 지운 줄 중 가장 아래 줄까지만 한 번에 아래로 모읍니다.
+        """
+        rows = self.rows
+        full_row = self.full_row
+        top = self.height - max(self.heights)   # 블록이 있는 가장 위 줄
+        if candidates is None:
+            candidates = range(top, self.height)
+        lines_to_clear = [y for y in candidates if rows[y] == full_row]
+        lines_cleared = len(lines_to_clear)
+        self.last_cleared = lines_cleared
+
+        if lines_to_clear:
+            # 줄을 지운 횟수에 따라 점수를 다르게 부여
+            self.score += self.line_scores.get(lines_cleared, 0)
+            self.lines += lines_cleared
+            # lock_shape()을 거치지 않고 불려도 스냅샷/렌더러가 지우기 전 보드를 다시 쓰지 않도록
+            self.board_version += 1
+
+            # top ~ bottom 사이의 남은 줄만 아래로 모으고 빈 줄을 위에 채움 (그 위는 이미 빈 줄)
+            bottom = lines_to_clear[-1] + 1
+            kept = [y for y in range(top, bottom) if rows[y] != full_row]
+            width = self.width
+            cells = self.cells
+            signatures = self.signatures
+            # 옮겨지는 줄들의 해시 값을 빼고 옮긴 뒤의 값을 더함 (줄마다 한 번씩, 칸 수와 상관없음)
+            zobrist_hash = self.board_hash ^ rows_hash(self.zobrist, signatures, top, bottom)
+            rows[top:bottom] = [0] * lines_cleared + [rows[y] for y in kept]
+            signatures[top:bottom] = [0] * lines_cleared + [signatures[y] for y in kept]
+            cells[top * width:bottom * width] = bytearray(lines_cleared * width) + b''.join(
+                cells[y * width:(y + 1) * width] for y in kept)
+            zobrist_hash ^= rows_hash(self.zobrist, signatures, top, bottom)
+            self.hash ^= self.board_hash ^ zobrist_hash
+            self.board_hash = zobrist_hash
+            self.update_heights(top)
+
+        return lines_cleared
+
+    def update_heights(self, top=None):
+        """
+        줄을 지운 뒤 열 높이를 다시 계산하는 함수. top 줄(기본값은 쌓인 부분의 맨 위)부터 아래로 내려가며
+        아직 높이를 찾지 못한 열만 확인하므로 쌓인 부분의 줄만 훑습니다.
+        """
+        height = self.height
+        if top is None:
+            top = height - max(self.heights)
+        heights = [0] * self.width
+        remaining = self.full_row
+        rows = self.rows
+        for y in range(top, height):
+            found = rows[y] & remaining
+            if found:
+                remaining ^= found
+                while found:
+                    bit = found & -found
+                    heights[bit.bit_length() - 1] = height - y
+                    found ^= bit
+                if not remaining:
+                    break
+        self.heights = heights
@@ -0,0 +1,185 @@
+"""
+리플레이를 PNG 프레임(과 ffmpeg가 있으면 동영상)으로 내보내는 모듈.
+창 없이(SDL 더미 비디오 드라이버) tetris2의 그리기 함수(draw_grid, draw_shape, draw_next_shape_and_score)를
+화면 대신 메모리 Surface에 그대로 써서, 게임 화면과 같은 그림을 실제 시간보다 훨씬 빠르게 만듭니다.
+
+중력 every번마다 한 프레임을 그리고, 마지막에 모든 액션을 적용한 최종 화면을 한 장 더 그립니다.
+부모 프로세스가 게임마다 ReplayPlayer의 보드 체크포인트를 만든 뒤, 체크포인트 사이 구간을 하나씩 프로세스 풀에 보냅니다.
+작업 프로세스는 받은 체크포인트에서 바로 재생을 시작하고, 프레임을 전체 번호로 저장하므로 따로 합치지 않아도 순서가 맞습니다.
+여러 게임의 구간을 한 풀에 함께 넣으므로 게임 수백 개도 모든 코어를 쓰며 내보냅니다.
+
+사용법: python export.py 리플레이파일... [-o 폴더] [--every 중력횟수] [--workers 수] [--format png|tga|bmp]
+                         [--video] [--fps 수]
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('TETRIS_TELEMETRY', '0')   # 내보내기는 플레이 기록을 남기지 않음
+
+import pygame  # noqa: E402
+
+from replay import ReplayPlayer  # noqa: E402
+
+# 프레임 파일 이름 (전체 프레임 번호와 확장자)
+FRAME_NAME = '%06d.{}'
+# 프레임 파일 형식. PNG는 작지만 저장이 프레임 그리기의 9할을 차지하고, TGA(RLE 압축)는 약 6배 빨리 씀
+FORMATS = ('png', 'tga', 'bmp')
+# 체크포인트 간격 (중력 횟수) = 작업 프로세스 하나가 맡는 구간 길이
+CHUNK_TICKS = 500
+
+# 작업 프로세스마다 보드 크기별로 다시 쓰는 tetris2.Tetris ((너비, 높이) -> 게임, get_game()에서 만듦)
+worker_games = {}
+
+
+def init_worker():
+    """
+    작업 프로세스가 시작될 때 한 번 기본 크기 보드의 그리기용 게임 객체를 만들어 두는 함수.
+    """
+    from engine import GRID_WIDTH, GRID_HEIGHT
+    get_game(GRID_WIDTH, GRID_HEIGHT)
+
+
+def get_game(width, height):
+    """
+    width x height 보드를 그리는 게임 객체(메모리 Surface에 그림)를 반환하는 함수. 보드 크기마다 한 번만 만듭니다.
+    큰 보드는 tetris2와 같이 칸 크기를 줄이고, 그래도 넘치면 떨어지는 블록을 따라 스크롤합니다.
+    """
+    game = worker_games.get((width, height))
+    if game is None:
+        import tetris2
+        game = worker_games[width, height] = tetris2.Tetris(width, height)
+        game.screen = pygame.Surface((tetris2.SCREEN_WIDTH, tetris2.SCREEN_HEIGHT))
+        game.game_started = True
+    return game
+
+
+def draw_frame(game, engine, path):
+    """
+    엔진 상태를 game의 메모리 Surface에 그리고 PNG 파일로 저장하는 함수.
+    """
+    game.engine = engine
+    game.game_over = engine.game_over
+    if not engine.game_over:
+        game.renderer.follow(engine, engine.current_shape)
+    game.screen.fill((0, 0, 0))
+    game.draw_playfield()
+    pygame.image.save(game.screen, path)
+
+
+def render_chunk(data, checkpoint, ticks, final, directory, every, frame_format='png'):
+    """
+    체크포인트 하나에서 시작해 ticks(중력 횟수 range)마다 프레임을 그리는 함수 (프로세스 풀 작업 단위).
+    final이 참이면(게임의 마지막 구간) 남은 액션을 모두 적용한 최종 화면도 그립니다. 그린 프레임 수를 반환합니다.
+    """
+    name = os.path.join(directory, FRAME_NAME.format(frame_format))
+    player = ReplayPlayer(data)
+    game = get_game(player.width, player.height)
+    _, index, state = checkpoint
+    engine = player.engine
+    engine.restore(state)
+    game.renderer.board_version = None   # 다른 게임/구간의 보드 레이어를 다시 쓰지 않도록
+    count = 0
+    for tick in ticks:
+        index = player.advance(index, tick)
+        draw_frame(game, engine, name % (tick // every))
+        count += 1
+    if final:
+        for _, action in player.events[index:]:
+            engine.step(action)
+        draw_frame(game, engine, name % (player.length // every + 1))
+        count += 1
+    return count
+
+
+def plan_chunks(path, out_dir, every, frame_format='png', interval=CHUNK_TICKS):
+    """
+    리플레이 하나의 체크포인트를 만들고 render_chunk() 인자 목록과 프레임 폴더를 반환하는 함수.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    player = ReplayPlayer(data)
+    player.build_checkpoints(interval)
+    directory = os.path.join(out_dir, os.path.splitext(os.path.basename(path))[0])
+    os.makedirs(directory, exist_ok=True)
+    checkpoints = player.checkpoints
+    chunks = []
+    for i, checkpoint in enumerate(checkpoints):
+        last = i == len(checkpoints) - 1
+        stop = player.length + 1 if last else checkpoints[i + 1][0]
+        start = -(-checkpoint[0] // every) * every   # 구간 안의 첫 every 배수
+        chunks.append((data, checkpoint, range(start, stop, every), last, directory, every, frame_format))
+    return chunks, directory
+
+
+def encode_video(directory, fps, frame_format='png'):
+    """
+    프레임 폴더를 ffmpeg로 mp4 동영상 하나로 합치고 경로를 반환하는 함수.
+    """
+    path = directory.rstrip(os.sep) + '.mp4'
+    subprocess.run(['ffmpeg', '-y', '-loglevel', 'error', '-framerate', str(fps),
+                    '-i', os.path.join(directory, FRAME_NAME.format(frame_format)), '-pix_fmt', 'yuv420p', path], check=True)
+    return path
+
+
+def export(paths, out_dir, every=1, workers=None, video=False, fps=30, frame_format='png'):
+    """
+    리플레이들을 프레임으로 내보내고 전체 프레임 수를 반환하는 함수.
+    게임의 마지막 구간이 끝나는 대로(다른 게임을 그리는 동안) 그 게임의 동영상을 만듭니다.
+    """
+    start = time.perf_counter()
+    tasks = []
+    games = []      # (리플레이 경로, 프레임 폴더, 마지막 구간의 작업 번호)
+    for path in paths:
+        chunks, directory = plan_chunks(path, out_dir, every, frame_format)
+        tasks += chunks
+        games.append((path, directory, len(tasks) - 1))
+
+    workers = workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(workers, initializer=init_worker) if workers > 1 else None
+    try:
+        results = (pool.map if pool else map)(render_chunk, *zip(*tasks))
+        total = 0
+        game = 0
+        for i, count in enumerate(results):
+            total += count
+            while game < len(games) and games[game][2] == i:
+                path, directory, _ = games[game]
+                output = encode_video(directory, fps, frame_format) if video else directory
+                print(f"{path}: {output}", flush=True)
+                game += 1
+    finally:
+        if pool:
+            pool.shutdown()
+    elapsed = time.perf_counter() - start
+    print(f"{len(paths)} replays, {total} frames in {elapsed:.2f}s ({total / elapsed:.0f} frames/s, "
+          f"{len(tasks)} chunks on {workers} workers)")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export Tetris replays to PNG frames or video")
+    parser.add_argument('replays', nargs='+')
+    parser.add_argument('-o', '--output', default='frames', help="output folder (one subfolder per replay)")
+    parser.add_argument('--every', type=int, default=1, help="gravity ticks per frame")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--video', action='store_true', help="also encode <replay>.mp4 with ffmpeg")
+    parser.add_argument('--fps', type=int, default=30, help="video frame rate")
+    parser.add_argument('--format', choices=FORMATS, default='png',
+                        help="frame image format (tga is much faster to write than png)")
+    args = parser.parse_args()
+
+    if args.video and shutil.which('ffmpeg') is None:
+        parser.error("--video needs ffmpeg on PATH")
+    export(args.replays, args.output, args.every, args.workers, args.video, args.fps, args.format)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+프레임 시간 측정(프로파일러)과 화면 성능 표시 모듈.
+한 프레임을 단계(logic, events, fill, draw_grid, draw_shape, hud, overlay, flip)로 나누어 시간을 재고,
+최근 프레임들을 고정 크기 링 버퍼(array)에 보관합니다. 켜져 있지 않으면 거의 비용이 들지 않습니다.
+"""
+import csv
+import os
+import time
+from array import array
+
+# 프레임 단계 (frame()/render()에서 mark()를 부르는 순서)
+PHASES = ('logic', 'events', 'fill', 'draw_grid', 'draw_shape', 'hud', 'overlay', 'flip')
+
+# 성능 표시 글자를 다시 그리는 간격 (초)
+OVERLAY_REFRESH = 0.25
+
+
+def percentile(values, fraction):
+    """
+    정렬된 값 목록에서 fraction(0~1) 위치의 값을 반환하는 함수.
+    """
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class FrameProfiler:
+    """
+    프레임 단계별 시간을 링 버퍼에 모으는 클래스.
+    begin_frame() -> mark(단계)... -> end_frame() 순서로 부르며, mark()는 직전 mark 이후 시간을 그 단계에 더합니다.
+    화면을 그리지 않는 루프에서는 end_frame() 없이 begin_frame()을 다시 부르며, 이때는 같은 프레임에 이어서 더하고
+    루프 사이에 쉰 시간은 단계에 넣지 않습니다.
+    """
+    def __init__(self, size=600, enabled=False):
+        self.size = size
+        self.enabled = enabled
+        self.show_overlay = False
+        self.samples = {phase: array('d', [0.0]) * size for phase in PHASES}
+        self.frame_times = array('d', [0.0]) * size     # 단계별 시간의 합 (쉰 시간 제외)
+        self.intervals = array('d', [0.0]) * size       # 이전 프레임 시작부터 (루프 사이 대기 포함)
+        self.index = 0          # 다음에 쓸 링 버퍼 위치
+        self.count = 0          # 버퍼에 쌓인 프레임 수 (최대 size)
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame_start = None
+        self.frame_open = False     # begin_frame 후 아직 end_frame 전인지
+        self.last = 0.0
+        self.overlay_lines = []
+        self.overlay_time = 0.0
+
+    def toggle_overlay(self):
+        """
+        성능 표시를 켜고 끄는 함수. 표시를 켜면 측정도 함께 켜집니다.
+        """
+        self.show_overlay = not self.show_overlay
+        if self.show_overlay:
+            self.enabled = True
+
+    def begin_frame(self):
+        """
+        프레임 측정을 시작하는 함수.
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.last = now
+        if self.frame_open:
+            return
+        self.frame_open = True
+        if self.frame_start is not None:
+            self.intervals[self.index] = now - self.frame_start
+        self.frame_start = now
+        current = self.current
+        for phase in PHASES:
+            current[phase] = 0.0
+
+    def mark(self, phase):
+        """
+        직전 mark 이후 걸린 시간을 phase 단계에 더하는 함수.
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.current[phase] += now - self.last
+        self.last = now
+
+    def end_frame(self):
+        """
+        프레임 측정을 끝내고 단계별 시간을 링 버퍼에 기록하는 함수.
+        """
+        if not self.enabled or not self.frame_open:
+            return
+        self.frame_open = False
+        index = self.index
+        for phase, value in self.current.items():
+            self.samples[phase][index] = value
+        self.frame_times[index] = sum(self.current.values())
+        self.index = (index + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def recent(self, buffer):
+        """
+        링 버퍼에서 기록된 값만 꺼내는 함수.
+        """
+        if self.count < self.size:
+            return buffer[:self.count]
+        return buffer
+
+    def stats(self, buffer):
+        """
+        버퍼 값의 (평균, p50, p99)를 밀리초로 반환하는 함수.
+        """
+        values = sorted(self.recent(buffer))
+        if not values:
+            return 0.0, 0.0, 0.0
+        return (1000 * sum(values) / len(values), 1000 * percentile(values, 0.5), 1000 * percentile(values, 0.99))
+
+    def histogram(self, phase, bins=10, limit_ms=None):
+        """
+        phase 단계 시간의 히스토그램을 (구간 끝 밀리초, 개수) 목록으로 반환하는 함수.
+        """
+        values = [1000 * v for v in self.recent(self.samples[phase])]
+        if not values:
+            return []
+        limit = limit_ms or max(values) or 1.0
+        counts = [0] * bins
+        for value in values:
+            counts[min(bins - 1, int(value / limit * bins))] += 1
+        return [(limit * (i + 1) / bins, counts[i]) for i in range(bins)]
+
+    def fps(self):
+        """
+        최근 프레임 간격으로 계산한 초당 프레임 수를 반환하는 함수.
+        """
+        intervals = [v for v in self.recent(self.intervals) if v > 0]
+        return len(intervals) / sum(intervals) if intervals else 0.0
+
+    def dump_csv(self, path=None):
+        """
+        링 버퍼에 남아 있는 프레임별 단계 시간(밀리초)을 오래된 순서로 CSV 파일에 저장하고 경로를 반환하는 함수.
+        """
+        if path is None:
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                f"profile-{time.strftime('%Y%m%d-%H%M%S')}.csv")
+        start = self.index if self.count == self.size else 0
+        order = [(start + i) % self.size for i in range(self.count)]
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(('frame', 'interval_ms', 'frame_ms') + PHASES)
+            for n, i in enumerate(order):
+                writer.writerow([n, f"{1000 * self.intervals[i]:.4f}", f"{1000 * self.frame_times[i]:.4f}"] +
+                                [f"{1000 * self.samples[phase][i]:.4f}" for phase in PHASES])
+        return path
+
+    def draw_overlay(self, screen, font, color, position=(5, 5)):
+        """
+        FPS와 프레임/단계별 시간(p50/p99)을 화면에 그리는 함수. 글자는 OVERLAY_REFRESH 초마다만 다시 그립니다.
+        """
+        if not self.show_overlay:
+            return
+        now = time.perf_counter()
+        if now - self.overlay_time > OVERLAY_REFRESH:
+            self.overlay_time = now
+            mean, p50, p99 = self.stats(self.frame_times)
+            lines = [f"FPS {self.fps():5.1f}  frame {p50:.2f}/{p99:.2f} ms"]
+            for phase in PHASES:
+                mean, p50, p99 = self.stats(self.samples[phase])
+                lines.append(f"{phase:10} {p50:6.2f} / {p99:6.2f}")
+            self.overlay_lines = [font.render(line, True, color) for line in lines]
+        x, y = position
+        screen.blits([(surface, (x, y + i * surface.get_height())) for i, surface in enumerate(self.overlay_lines)],
+                     False)
@@ -0,0 +1,221 @@
+"""
+pygame 보드 렌더러 모듈.
+격자선이 그려진 정적 배경, 고정된 블록만 담은 보드 레이어, 색상별로 미리 그려 둔 칸 타일을 캐시해 두고
+매 프레임에는 보드 레이어 한 번과 떨어지는 블록 타일들을 Surface.blits 한 번으로 그립니다.
+글꼴과 글자 Surface도 여기서 캐시합니다.
+pygame.init()은 쓰지 않는 mixer, joystick 등까지 모두 켜므로, display와 font만 처음 쓸 때 켭니다.
+"""
+import time
+from functools import lru_cache
+
+import pygame
+
+from engine import GRID_WIDTH, GRID_HEIGHT
+
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+
+# 크기별 글꼴 (한 번만 불러옴)
+FONTS = {}
+
+# 보드를 화면에 맞출 때 칸 크기의 최솟값 (픽셀). 이보다 작아져야 하면 보드 일부만 보이고 스크롤합니다.
+MIN_CELL_SIZE = 6
+
+
+def open_window(width, height, caption):
+    """
+    display 서브시스템만 켜고 창을 만들어 화면 Surface를 반환하는 함수.
+    """
+    if not pygame.display.get_init():
+        pygame.display.init()
+    screen = pygame.display.set_mode((width, height))
+    pygame.display.set_caption(caption)
+    return screen
+
+
+def get_ticks():
+    """
+    밀리초 단위 시각을 반환하는 함수. pygame.time.get_ticks()는 pygame.init() 없이는 0만 돌려주므로 대신 씁니다.
+    """
+    return int(time.perf_counter() * 1000)
+
+
+def get_font(size):
+    """
+    기본 글꼴을 크기별로 한 번만 만들어 돌려주는 함수. font 서브시스템은 처음 부를 때 켭니다.
+    SysFont(None, ...)은 결국 같은 기본 글꼴을 쓰면서 시스템 글꼴 목록(fc-list)부터 읽으므로 Font를 바로 씁니다.
+    """
+    font = FONTS.get(size)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = FONTS[size] = pygame.font.Font(None, size)
+    return font
+
+
+def fit_board(area_width, area_height, columns, rows, max_size, min_size=MIN_CELL_SIZE):
+    """
+    columns x rows 칸 보드를 area_width x area_height 픽셀 영역에 맞추는 함수.
+    (칸 크기, 보이는 열 수, 보이는 줄 수)를 반환하며, 칸 크기는 max_size 이하이고 min_size보다 작아지지 않습니다.
+    """
+    size = max(min_size, min(max_size, area_width // columns, area_height // rows))
+    return size, min(columns, area_width // size), min(rows, area_height // size)
+
+
+@lru_cache(maxsize=128)
+def render_text(text, size, color):
+    """
+    글자 Surface를 (글자, 크기, 색상)별로 캐시하는 함수. 글자가 바뀔 때만 새로 그립니다.
+    돌려받은 Surface는 여러 곳에서 함께 쓰므로 수정하면 안 됩니다.
+    """
+    return get_font(size).render(text, True, color)
+
+
+class BoardRenderer:
+    """
+    엔진 보드를 화면에 그리는 클래스.
+    화면에는 보드 중 columns x rows 칸(뷰포트)만 그리며, 큰 보드에서는 follow()로 떨어지는 블록을 따라 스크롤합니다.
+    보드 레이어는 엔진의 board_version이 바뀔 때(블록 고정, 줄 제거, 새 게임)나 스크롤했을 때만 보이는 칸만으로 다시 만듭니다.
+    """
+    def __init__(self, palette, grid_size, line_color=WHITE, columns=GRID_WIDTH, rows=GRID_HEIGHT):
+        self.palette = palette          # 블록 번호 -> 색상 (0번은 빈 칸)
+        self.grid_size = grid_size
+        self.line_color = line_color
+        self.columns = columns          # 뷰포트 크기 (칸)
+        self.rows = rows
+        self.scroll_x = 0               # 뷰포트 왼쪽 위 칸의 보드 좌표
+        self.scroll_y = 0
+        self.tiles = [self.make_tile(color) for color in palette]
+        self.ghost_tiles = [self.make_ghost_tile(color) for color in palette]
+        self.background = self.make_background()
+        self.board_layer = self.background.copy()
+        self.board_version = None       # 보드 레이어를 마지막으로 만든 (엔진 보드 버전, 스크롤 위치)
+
+    @staticmethod
+    def prepare(surface):
+        """
+        화면이 이미 만들어져 있으면 화면 픽셀 형식으로 바꿔 blit을 빠르게 하는 함수.
+        """
+        if pygame.display.get_surface() is not None:
+            return surface.convert()
+        return surface
+
+    def make_tile(self, color):
+        """
+        색상 하나로 채워지고 테두리가 있는 칸 타일을 만드는 함수.
+        """
+        size = self.grid_size
+        tile = pygame.Surface((size, size))
+        tile.fill(color)
+        pygame.draw.rect(tile, self.line_color, (0, 0, size, size), 1)
+        return self.prepare(tile)
+
+    def make_ghost_tile(self, color):
+        """
+        빈 칸 위에 블록 색상의 안쪽 테두리만 그린 고스트 블록용 타일을 만드는 함수.
+        """
+        size = self.grid_size
+        tile = self.tiles[0].copy()
+        pygame.draw.rect(tile, color, (2, 2, size - 4, size - 4), 2)
+        return tile
+
+    def make_background(self):
+        """
+        빈 칸과 격자선만 그려진 정적 배경을 만드는 함수.
+        """
+        size = self.grid_size
+        background = pygame.Surface((self.columns * size, self.rows * size))
+        background = self.prepare(background)
+        empty_tile = self.tiles[0]
+        background.blits([(empty_tile, (x * size, y * size))
+                          for y in range(self.rows) for x in range(self.columns)], False)
+        return background
+
+    def follow(self, engine, piece, margin=4):
+        """
+        piece가 뷰포트 가장자리에서 margin칸 안쪽에 보이도록 스크롤 위치를 옮기는 함수. 보드 전체가 보이면 아무것도 하지 않습니다.
+        """
+        state = piece.state
+        for axis, start, length, view, board in (('scroll_x', piece.x, state.width, self.columns, engine.width),
+                                                 ('scroll_y', piece.y, state.height, self.rows, engine.height)):
+            if view >= board:
+                continue
+            edge = min(margin, (view - length) // 2)
+            scroll = getattr(self, axis)
+            if start - edge < scroll:
+                scroll = start - edge
+            elif start + length + edge > scroll + view:
+                scroll = start + length + edge - view
+            setattr(self, axis, max(0, min(scroll, board - view)))
+
+    def rebuild_board_layer(self, engine):
+        """
+        배경 위에 고정된 블록을 그려 보드 레이어를 다시 만드는 함수.
+        """
+        size = self.grid_size
+        tiles = self.tiles
+        cells = engine.cells
+        width = engine.width
+        left = self.scroll_x
+        columns = min(self.columns, width - left)
+        layer = self.background.copy()
+        blits = []
+        for y in range(min(self.rows, engine.height - self.scroll_y)):
+            start = (self.scroll_y + y) * width + left
+            row = cells[start:start + columns]
+            if any(row):
+                blits += [(tiles[cell], (x * size, y * size)) for x, cell in enumerate(row) if cell]
+        layer.blits(blits, False)
+        self.board_layer = layer
+        self.board_version = (engine.board_version, left, self.scroll_y)
+
+    def draw_board(self, screen, engine):
+        """
+        고정된 보드를 화면에 그리는 함수. 보드가 바뀌었거나 스크롤한 경우에만 레이어를 다시 만듭니다.
+        """
+        if self.board_version != (engine.board_version, self.scroll_x, self.scroll_y):
+            self.rebuild_board_layer(engine)
+        screen.blit(self.board_layer, (0, 0))
+
+    def visible_cells(self, piece):
+        """
+        블록의 칸 중 뷰포트 안에 있는 칸의 뷰포트 좌표를 반환하는 함수.
+        """
+        ox = piece.x - self.scroll_x
+        oy = piece.y - self.scroll_y
+        columns = self.columns
+        rows = self.rows
+        return [(ox + x, oy + y) for x, y in piece.cells if 0 <= ox + x < columns and 0 <= oy + y < rows]
+
+    def piece_rect(self, piece):
+        """
+        보드 위 블록이 차지하는 화면 영역(pygame.Rect)을 반환하는 함수. 뷰포트 밖에 있으면 None을 반환합니다.
+        """
+        cells = self.visible_cells(piece)
+        if not cells:
+            return None
+        size = self.grid_size
+        xs = [x for x, _ in cells]
+        ys = [y for _, y in cells]
+        left, top = min(xs), min(ys)
+        return pygame.Rect(left * size, top * size, (max(xs) - left + 1) * size, (max(ys) - top + 1) * size)
+
+    def draw_piece(self, screen, piece, origin=None):
+        """
+        블록을 그리는 함수. origin이 없으면 보드 위의 블록 위치에, 있으면 그 좌표를 기준으로 그립니다.
+        """
+        size = self.grid_size
+        tile = self.tiles[piece.id]
+        if origin is None:
+            screen.blits([(tile, (x * size, y * size)) for x, y in self.visible_cells(piece)], False)
+        else:
+            ox, oy = origin
+            screen.blits([(tile, (ox + x * size, oy + y * size)) for x, y in piece.cells], False)
+
+    def draw_ghost(self, screen, piece):
+        """
+        블록이 떨어질 위치(엔진의 ghost_piece)를 테두리만 있는 타일로 그리는 함수.
+        """
+        size = self.grid_size
+        tile = self.ghost_tiles[piece.id]
+        screen.blits([(tile, (x * size, y * size)) for x, y in self.visible_cells(piece)], False)
@@ -0,0 +1,259 @@
+"""
+게임 리플레이 기록과 재생 모듈.
+엔진은 게임마다 seed로 블록 순서를 정하므로, seed와 (중력 횟수, 액션) 목록만 있으면 게임 전체를 그대로 재현할 수 있습니다.
+
+파일 형식 (정수는 모두 varint):
+  헤더: b'TTRP', 버전(1바이트), seed(zigzag, 음수도 가능), 보드 너비, 높이, 1~4줄 점수, 이벤트 수
+  이벤트: (이전 이벤트 이후 중력 횟수 << 3) | 액션. 마지막 NOOP 이벤트는 남은 중력 횟수만 나타냅니다.
+  트레일러: 최종 점수, 지운 줄 수, 고정된 블록 수 (재생 결과 확인용)
+이전 버전 파일도 읽을 수 있습니다. 버전 1은 seed를 zigzag 없이 저장했고, 버전 1~2에는 보드 크기가 없습니다(기본 크기).
+
+사용법: python replay.py 리플레이파일...
+"""
+import bisect
+import os
+import struct
+import sys
+import time
+
+from engine import TetrisEngine, GRID_WIDTH, GRID_HEIGHT, NOOP
+
+MAGIC = b'TTRP'
+VERSION = 3
+# 읽을 수 있는 버전
+VERSIONS = (1, 2, 3)
+HEADER = struct.Struct('<4sB')
+
+# 액션은 이벤트 값의 아래 3비트에 들어감
+ACTION_BITS = 3
+ACTION_MASK = (1 << ACTION_BITS) - 1
+
+# 리플레이 파일을 저장하는 폴더
+REPLAY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'replays')
+
+
+def write_varint(out, value):
+    """
+    음이 아닌 정수를 varint(7비트씩, 최상위 비트는 계속 표시)로 bytearray에 추가하는 함수.
+    음수는 zigzag()로 바꾼 뒤 넘겨야 합니다.
+    """
+    if value < 0:
+        raise ValueError(f"varint must not be negative: {value}")
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    """
+    data[pos]에서 varint 하나를 읽어 (값, 다음 위치)를 반환하는 함수.
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def zigzag(value):
+    """
+    부호 있는 정수를 음이 아닌 정수로 바꾸는 함수 (0, -1, 1, -2, ... -> 0, 1, 2, 3, ...).
+    """
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value):
+    """
+    zigzag()로 바꾼 정수를 원래 부호 있는 정수로 되돌리는 함수.
+    """
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+class ReplayRecorder:
+    """
+    엔진에 들어가는 액션과 중력을 그대로 전달하면서 (중력 횟수, 액션)을 기록하는 클래스.
+    front-end는 engine.step / engine.tick 대신 이 클래스의 step / tick을 부릅니다.
+    """
+    def __init__(self, engine):
+        self.engine = engine
+        self.seed = engine.seed
+        self.events = []        # (중력 횟수, 액션) 목록
+
+    def step(self, action):
+        """
+        액션을 엔진에 적용하고, 상태가 바뀐 경우에만 기록하는 함수.
+        """
+        changed = self.engine.step(action)
+        if changed:
+            self.events.append((self.engine.ticks, action))
+        return changed
+
+    def tick(self):
+        """
+        중력을 엔진에 적용하는 함수. 중력은 횟수로만 기록되므로 따로 남기지 않습니다.
+        """
+        return self.engine.tick()
+
+    def to_bytes(self):
+        """
+        기록을 리플레이 파일 형식의 bytes로 만드는 함수.
+        """
+        engine = self.engine
+        out = bytearray(HEADER.pack(MAGIC, VERSION))
+        write_varint(out, zigzag(self.seed))
+        write_varint(out, engine.width)
+        write_varint(out, engine.height)
+        for lines in range(1, 5):
+            write_varint(out, engine.line_scores.get(lines, 0))
+        write_varint(out, len(self.events) + 1)
+        last = 0
+        for tick, action in self.events:
+            write_varint(out, ((tick - last) << ACTION_BITS) | action)
+            last = tick
+        write_varint(out, (engine.ticks - last) << ACTION_BITS | NOOP)
+        write_varint(out, engine.score)
+        write_varint(out, engine.lines)
+        write_varint(out, engine.pieces)
+        return bytes(out)
+
+    def save(self, path=None):
+        """
+        기록을 파일로 저장하고 경로를 반환하는 함수. 경로가 없으면 replays 폴더에 시간과 seed로 이름을 붙입니다.
+        """
+        if path is None:
+            os.makedirs(REPLAY_DIR, exist_ok=True)
+            path = os.path.join(REPLAY_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{self.seed}.ttr")
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+        return path
+
+
+class ReplayPlayer:
+    """
+    리플레이를 화면 없이 최대 속도로 다시 실행하는 클래스.
+    build_checkpoints()로 일정 중력 횟수마다 보드 체크포인트를 만들어 두면 seek()로 원하는 시점에 바로 갈 수 있습니다.
+    """
+    def __init__(self, data):
+        if isinstance(data, str):
+            with open(data, 'rb') as f:
+                data = f.read()
+        magic, version = HEADER.unpack_from(data)
+        if magic != MAGIC or version not in VERSIONS:
+            raise ValueError("Not a Tetris replay file")
+        pos = HEADER.size
+        self.seed, pos = read_varint(data, pos)
+        if version >= 2:
+            self.seed = unzigzag(self.seed)
+        self.width, self.height = GRID_WIDTH, GRID_HEIGHT
+        if version >= 3:
+            self.width, pos = read_varint(data, pos)
+            self.height, pos = read_varint(data, pos)
+        self.line_scores = {}
+        for lines in range(1, 5):
+            self.line_scores[lines], pos = read_varint(data, pos)
+        count, pos = read_varint(data, pos)
+        self.events = []        # (중력 횟수, 액션) 목록, 중력 횟수는 누적값
+        tick = 0
+        for _ in range(count):
+            value, pos = read_varint(data, pos)
+            tick += value >> ACTION_BITS
+            self.events.append((tick, value & ACTION_MASK))
+        self.final = []         # 기록 당시의 (점수, 지운 줄 수, 고정된 블록 수)
+        for _ in range(3):
+            value, pos = read_varint(data, pos)
+            self.final.append(value)
+        self.final = tuple(self.final)
+        self.engine = TetrisEngine(self.line_scores, self.seed, width=self.width, height=self.height)
+        self.checkpoints = []   # (중력 횟수, 다음 이벤트 위치, 엔진 체크포인트)
+
+    @property
+    def length(self):
+        """리플레이 전체의 중력 횟수."""
+        return self.events[-1][0] if self.events else 0
+
+    def advance(self, index, until):
+        """
+        index번째 이벤트부터, 중력 횟수가 until보다 작은 이벤트까지 적용하고 중력 횟수를 until로 맞추는 함수.
+        다음에 적용할 이벤트 위치를 반환합니다.
+        """
+        engine = self.engine
+        events = self.events
+        while index < len(events) and events[index][0] < until:
+            tick, action = events[index]
+            while engine.ticks < tick and not engine.game_over:
+                engine.tick()
+            engine.step(action)
+            index += 1
+        while engine.ticks < until and not engine.game_over:
+            engine.tick()
+        return index
+
+    def run(self):
+        """
+        처음부터 끝까지 재생하고 엔진을 반환하는 함수.
+        """
+        self.engine.reset(self.seed)
+        index = self.advance(0, self.length)
+        for tick, action in self.events[index:]:
+            self.engine.step(action)
+        return self.engine
+
+    def verify(self):
+        """
+        끝까지 재생한 결과가 기록 당시의 점수, 줄 수, 블록 수와 같은지 확인하는 함수.
+        """
+        engine = self.run()
+        return (engine.score, engine.lines, engine.pieces) == self.final
+
+    def build_checkpoints(self, interval=500):
+        """
+        처음부터 재생하면서 중력 interval번마다 엔진 체크포인트를 만드는 함수.
+        """
+        engine = self.engine
+        engine.reset(self.seed)
+        self.checkpoints = [(0, 0, engine.checkpoint())]
+        index = 0
+        for tick in range(interval, self.length + 1, interval):
+            index = self.advance(index, tick)
+            if engine.game_over:
+                break
+            self.checkpoints.append((tick, index, engine.checkpoint()))
+
+    def seek(self, tick):
+        """
+        중력 tick번째가 적용된 직후(그 시점의 액션 전) 상태로 엔진을 옮기고 반환하는 함수.
+        가장 가까운 앞쪽 체크포인트에서부터 재생합니다.
+        """
+        if not self.checkpoints:
+            self.build_checkpoints()
+        position = bisect.bisect_right(self.checkpoints, tick, key=lambda checkpoint: checkpoint[0]) - 1
+        start, index, state = self.checkpoints[position]
+        self.engine.restore(state)
+        self.advance(index, tick)
+        return self.engine
+
+
+def replay_files(paths):
+    """
+    리플레이 파일들을 화면 없이 다시 실행하고 기록과 결과가 같은지 출력하는 함수.
+    """
+    start = time.perf_counter()
+    mismatches = 0
+    for path in paths:
+        player = ReplayPlayer(path)
+        ok = player.verify()
+        mismatches += not ok
+        engine = player.engine
+        print(f"{path}: score={engine.score} lines={engine.lines} pieces={engine.pieces} "
+              f"{'OK' if ok else f'MISMATCH (recorded {player.final})'}")
+    print(f"{len(paths)} replays in {time.perf_counter() - start:.2f}s, {mismatches} mismatches")
+    return mismatches
+
+
+if __name__ == "__main__":
+    sys.exit(1 if replay_files(sys.argv[1:]) else 0)
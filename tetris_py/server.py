@@ -0,0 +1,347 @@
+"""
+화면 없이 여러 게임을 동시에 돌리는 asyncio 게임 서버 모듈.
+접속(TCP 또는 Unix 소켓) 하나가 게임 세션 하나이며, 모든 세션의 중력은 하나의 스케줄러가 처리합니다.
+스케줄러는 세션별 다음 중력 시각을 힙에 넣어 두고 이벤트 루프 타이머 하나만 가장 이른 시각에 맞춰 둡니다.
+
+프로토콜 (한 줄에 명령 하나, 대소문자 구분 없음):
+  left | right | down | rotate  -> "OK 1" (움직였음) 또는 "OK 0"
+  drop                          -> "LOCK 지운줄 점수 줄수" (게임이 끝났으면 이어서 "OVER 점수 줄수 블록수")
+  state                         -> "STATE 점수 줄수 블록수 중력횟수 블록 회전 x y 다음블록 줄1 ... 줄20" (줄은 16진수 비트마스크)
+  speed 밀리초                  -> "OK" (중력 간격 변경)
+  new [seed]                    -> "OK seed" (새 게임)
+  quit                          -> 접속 종료
+인자가 정수가 아니면(speed는 1 이상) "ERR bad argument"를 보내고 접속은 그대로 둡니다.
+줄이 너무 길면(64KiB 넘게 줄바꿈이 없으면) "ERR line too long"을 보내고 접속을 끊습니다.
+중력으로 블록이 고정되면 서버가 먼저 "LOCK ..."(과 "OVER ...")를 보냅니다.
+
+사용법:
+  python server.py serve [--host 주소] [--port 번호 | --unix 경로] [--stats 초]
+  python server.py client [--sessions 수] [--rate 초당액션] [--duration 초] [--port 번호 | --unix 경로]
+"""
+import argparse
+import asyncio
+import heapq
+import itertools
+import random
+import sys
+import time
+
+from engine import TetrisEngine, LEFT, RIGHT, DOWN, ROTATE, DROP
+
+DEFAULT_PORT = 7878
+# 세션의 기본 중력 간격 (밀리초, tetris2.py의 Speed 1과 같음)
+DEFAULT_DROP_SPEED = 500
+# 보내지 못하고 쌓인 데이터가 이보다 많으면 느린 접속으로 보고 끊음 (바이트)
+MAX_WRITE_BUFFER = 64 * 1024
+
+COMMANDS = {'left': LEFT, 'right': RIGHT, 'down': DOWN, 'rotate': ROTATE, 'drop': DROP}
+
+
+def parse_int(text):
+    """
+    명령 인자 text를 정수로 읽는 함수. 정수가 아니면 None을 반환합니다.
+    """
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
+
+class Scheduler:
+    """
+    모든 세션의 중력을 처리하는 스케줄러.
+    (다음 중력 시각, 순번, 세션)을 힙에 넣고, 루프 타이머 하나를 힙에서 가장 이른 시각에 맞춰 둡니다.
+    속도가 바뀌거나 끊긴 세션의 항목은 힙에서 바로 지우지 않고 꺼낼 때 건너뜁니다.
+    """
+    def __init__(self, loop):
+        self.loop = loop
+        self.heap = []
+        self.counter = itertools.count()
+        self.timer = None
+        self.ticks = 0          # 처리한 중력 횟수
+        self.max_lag = 0.0      # 예정 시각보다 늦게 처리된 최대 시간 (초, stats가 읽고 초기화)
+
+    def schedule(self, session, when):
+        """
+        session의 다음 중력을 when(루프 시각) 에 예약하는 함수.
+        """
+        self.push(session, when)
+        if self.timer is None or when < self.timer.when():
+            if self.timer:
+                self.timer.cancel()
+            self.timer = self.loop.call_at(when, self.run_due)
+
+    def push(self, session, when):
+        """
+        타이머는 건드리지 않고 힙에만 예약을 넣는 함수.
+        """
+        session.due = when
+        heapq.heappush(self.heap, (when, next(self.counter), session))
+
+    def run_due(self):
+        """
+        예정 시각이 지난 세션들의 중력을 처리하고 다음 타이머를 맞추는 함수.
+        """
+        self.timer = None
+        now = self.loop.time()
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            when, _, session = heapq.heappop(heap)
+            if session.closed or session.due != when:
+                continue
+            lag = now - when
+            if lag > self.max_lag:
+                self.max_lag = lag
+            self.ticks += 1
+            session.gravity()
+            if not session.closed and not session.engine.game_over:
+                interval = session.drop_speed / 1000
+                # 많이 밀렸으면 한꺼번에 따라잡지 않고 지금부터 다시 셈 (타이머는 끝에서 한 번만 맞춤)
+                self.push(session, when + interval if lag < interval else now + interval)
+        if heap:
+            self.timer = self.loop.call_at(heap[0][0], self.run_due)
+
+
+class Session:
+    """
+    접속 하나에 해당하는 게임 세션. 엔진과 중력 간격, 응답을 보낼 writer를 가집니다.
+    """
+    def __init__(self, scheduler, writer, seed=None):
+        self.scheduler = scheduler
+        self.writer = writer
+        self.engine = TetrisEngine(seed=seed)
+        self.drop_speed = DEFAULT_DROP_SPEED
+        self.due = None
+        self.closed = False
+
+    def start(self):
+        """
+        첫 중력을 예약하는 함수.
+        """
+        self.scheduler.schedule(self, self.scheduler.loop.time() + self.drop_speed / 1000)
+
+    def send(self, line):
+        """
+        응답 한 줄을 보내는 함수. 보내지 못한 데이터가 너무 많이 쌓이면 접속을 끊습니다.
+        """
+        if self.closed:
+            return
+        self.writer.write(line.encode() + b'\n')
+        if self.writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            self.close()
+
+    def close(self):
+        """
+        세션을 끝내는 함수. 힙에 남은 항목은 스케줄러가 꺼낼 때 건너뜁니다.
+        """
+        if not self.closed:
+            self.closed = True
+            self.writer.close()
+
+    def gravity(self):
+        """
+        스케줄러가 부르는 중력 한 번. 블록이 고정되었으면 결과를 보냅니다.
+        """
+        if self.engine.tick():
+            self.report_lock()
+
+    def report_lock(self):
+        """
+        블록 고정 결과(와 게임 종료)를 보내는 함수.
+        """
+        engine = self.engine
+        self.send(f"LOCK {engine.last_cleared} {engine.score} {engine.lines}")
+        if engine.game_over:
+            self.send(f"OVER {engine.score} {engine.lines} {engine.pieces}")
+
+    def state_line(self):
+        """
+        state 명령의 응답을 만드는 함수.
+        """
+        engine = self.engine
+        piece = engine.current_shape
+        rows = ' '.join(f'{row:x}' for row in engine.rows)
+        return (f"STATE {engine.score} {engine.lines} {engine.pieces} {engine.ticks} "
+                f"{piece.index} {piece.rotation} {piece.x} {piece.y} {engine.next_shape.index} {rows}")
+
+    def handle(self, line):
+        """
+        명령 한 줄을 처리하는 함수. 접속을 끝내야 하면 False를 반환합니다.
+        """
+        words = line.split()
+        if not words:
+            return True
+        command = words[0].lower()
+        action = COMMANDS.get(command)
+        if action is not None:
+            changed = self.engine.step(action)
+            if action == DROP and changed:
+                self.report_lock()
+            else:
+                self.send(f"OK {int(changed)}")
+        elif command == 'state':
+            self.send(self.state_line())
+        elif command == 'speed':
+            speed = parse_int(words[1]) if len(words) == 2 else None
+            if speed is None or speed <= 0:
+                self.send("ERR bad argument")
+                return True
+            self.drop_speed = speed
+            if not self.engine.game_over:
+                self.start()
+            self.send("OK")
+        elif command == 'new':
+            seed = parse_int(words[1]) if len(words) > 1 else None
+            if len(words) > 1 and seed is None:
+                self.send("ERR bad argument")
+                return True
+            self.engine.reset(seed)
+            self.start()
+            self.send(f"OK {self.engine.seed}")
+        elif command == 'quit':
+            return False
+        else:
+            self.send(f"ERR unknown command {command!r}")
+        return True
+
+
+class GameServer:
+    """
+    접속마다 세션을 만들고 하나의 스케줄러로 모든 세션의 중력을 처리하는 서버.
+    """
+    def __init__(self):
+        self.scheduler = None
+        self.sessions = set()
+        self.commands = 0       # 처리한 명령 수
+
+    async def handle_client(self, reader, writer):
+        """
+        접속 하나를 처리하는 함수. 접속이 끊기면 세션도 끝납니다.
+        """
+        session = Session(self.scheduler, writer)
+        self.sessions.add(session)
+        session.start()
+        try:
+            while not session.closed:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    # 줄이 스트림 버퍼 한도(기본 64KiB)보다 길면 readline()이 ValueError를 냄: 이 세션만 끝냄
+                    session.send("ERR line too long")
+                    break
+                if not line:
+                    break
+                self.commands += 1
+                if not session.handle(line.decode(errors='replace')):
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions.discard(session)
+            session.close()
+
+    async def report(self, interval):
+        """
+        interval초마다 세션 수, 초당 중력/명령 수, 최대 지연을 출력하는 함수.
+        """
+        scheduler = self.scheduler
+        ticks, commands = scheduler.ticks, self.commands
+        while True:
+            await asyncio.sleep(interval)
+            print(f"sessions={len(self.sessions)} gravity/s={(scheduler.ticks - ticks) / interval:.0f} "
+                  f"commands/s={(self.commands - commands) / interval:.0f} max_lag={scheduler.max_lag * 1000:.1f}ms",
+                  flush=True)
+            ticks, commands = scheduler.ticks, self.commands
+            scheduler.max_lag = 0.0
+
+    async def serve(self, host='127.0.0.1', port=DEFAULT_PORT, unix=None, stats=0):
+        """
+        서버를 열고 끝날 때까지 실행하는 함수.
+        """
+        self.scheduler = Scheduler(asyncio.get_running_loop())
+        if unix:
+            server = await asyncio.start_unix_server(self.handle_client, unix)
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port, backlog=1024)
+        print(f"Serving on {unix or f'{host}:{port}'}", flush=True)
+        if stats:
+            asyncio.create_task(self.report(stats))
+        async with server:
+            await server.serve_forever()
+
+
+async def stub_session(open_connection, rate, deadline, totals):
+    """
+    무작위 액션을 초당 rate번 보내는 시험용 세션. 게임이 끝나면 새 게임을 시작합니다.
+    """
+    reader, writer = await open_connection()
+    rng = random.Random()
+    actions = list(COMMANDS)
+    loop = asyncio.get_running_loop()
+
+    async def read_replies():
+        while line := await reader.readline():
+            kind = line.split(None, 1)[0].decode()
+            totals[kind] = totals.get(kind, 0) + 1
+            if kind == 'OVER':
+                writer.write(b'new\n')
+
+    reader_task = asyncio.create_task(read_replies())
+    try:
+        while loop.time() < deadline:
+            await asyncio.sleep(rng.expovariate(rate))
+            writer.write(rng.choice(actions).encode() + b'\n')
+        writer.write(b'quit\n')
+        await writer.drain()
+        await reader_task
+    except ConnectionError:
+        totals['disconnected'] = totals.get('disconnected', 0) + 1
+    finally:
+        reader_task.cancel()
+        writer.close()
+
+
+async def run_client(sessions, rate, duration, host='127.0.0.1', port=DEFAULT_PORT, unix=None):
+    """
+    시험용 세션 sessions개를 동시에 duration초 동안 돌리고 받은 응답 수를 출력하는 함수.
+    """
+    if unix:
+        def open_connection():
+            return asyncio.open_unix_connection(unix)
+    else:
+        def open_connection():
+            return asyncio.open_connection(host, port)
+    totals = {}
+    start = time.perf_counter()
+    deadline = asyncio.get_running_loop().time() + duration
+    await asyncio.gather(*(stub_session(open_connection, rate, deadline, totals) for _ in range(sessions)))
+    elapsed = time.perf_counter() - start
+    replies = sum(count for kind, count in totals.items() if kind != 'disconnected')
+    print(f"{sessions} sessions, {elapsed:.1f}s: " + ' '.join(f"{kind}={count}" for kind, count in sorted(totals.items())) +
+          f" ({replies / elapsed:.0f} replies/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless multi-session Tetris server")
+    parser.add_argument('mode', choices=('serve', 'client'))
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', metavar='PATH', help="use a Unix socket instead of TCP")
+    parser.add_argument('--stats', type=float, default=5.0, help="server stats interval in seconds, 0 to disable")
+    parser.add_argument('--sessions', type=int, default=100)
+    parser.add_argument('--rate', type=float, default=5.0, help="client actions per second per session")
+    parser.add_argument('--duration', type=float, default=10.0)
+    args = parser.parse_args()
+
+    try:
+        if args.mode == 'serve':
+            asyncio.run(GameServer().serve(args.host, args.port, args.unix, args.stats))
+        else:
+            asyncio.run(run_client(args.sessions, args.rate, args.duration, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
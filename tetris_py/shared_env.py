@@ -0,0 +1,235 @@
+"""
+공유 메모리로 관찰값을 주고받는 다중 프로세스 환경 풀 모듈 (강화학습 rollout용).
+작업 프로세스마다 TetrisEngine 여러 개를 화면 없이 돌리고, 보드/블록/점수를 multiprocessing.shared_memory 블록 하나에
+바로 씁니다. 학습 쪽은 같은 블록을 NumPy 배열로 보므로 pickle이나 복사 없이 읽습니다.
+액션도 같은 블록에 쓰고, 동기화는 작업 프로세스마다 "시작" 세마포어 하나와 모두가 함께 쓰는 "끝" 세마포어 하나뿐입니다.
+
+배열 이름과 모양은 batch_env.BatchTetris와 같습니다 (boards는 칸마다 블록 번호, 0은 빈 칸).
+step()은 BatchTetris처럼 보드마다 액션 하나를 적용한 뒤 중력 한 번을 적용하며, 끝난 게임은 reset(mask)으로 다시 시작합니다.
+
+사용법: python shared_env.py [작업 프로세스 수] [환경 수] [스텝 수]
+"""
+import multiprocessing
+import os
+import random
+import sys
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from engine import TetrisEngine, GRID_WIDTH, GRID_HEIGHT, DROP
+
+# 작업 프로세스에 보내는 명령 (control[0])
+CLOSE, STEP, RESET = range(3)
+
+# 작업 프로세스가 살아 있는지 확인하며 기다리는 간격 (초)
+POLL_INTERVAL = 1.0
+
+# (이름, dtype, 보드 모양을 붙이는지) - 공유 메모리 안에 이 순서로 놓임
+FIELDS = (
+    ('boards', np.uint8, True),
+    ('piece', np.int32, False),
+    ('rotation', np.int32, False),
+    ('x', np.int32, False),
+    ('y', np.int32, False),
+    ('next_piece', np.int32, False),
+    ('score', np.int64, False),
+    ('lines', np.int64, False),
+    ('reward', np.int64, False),
+    ('game_over', np.bool_, False),
+    ('actions', np.uint8, False),
+    ('mask', np.bool_, False),      # reset()에서 다시 시작할 환경
+)
+
+
+def layout(n, width, height):
+    """
+    환경 n개의 공유 메모리 배치 [(이름, dtype, 모양, 시작 위치)]와 전체 크기를 반환하는 함수.
+    배열마다 8바이트 경계에서 시작합니다.
+    """
+    fields = []
+    offset = 0
+    for name, dtype, board in FIELDS + (('control', np.int32, None),):
+        shape = (n, height, width) if board else (1,) if board is None else (n,)
+        fields.append((name, dtype, shape, offset))
+        offset += -(-np.dtype(dtype).itemsize * int(np.prod(shape)) // 8) * 8
+    return fields, offset
+
+
+def attach(buffer, n, width, height):
+    """
+    공유 메모리 버퍼 위에 배열 이름 -> NumPy 뷰 사전을 만드는 함수 (복사 없음).
+    """
+    fields, _ = layout(n, width, height)
+    return {name: np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+            for name, dtype, shape, offset in fields}
+
+
+def worker_main(name, n, width, height, start, stop, seed, go, done):
+    """
+    작업 프로세스 본체. start~stop-1번 환경의 엔진을 들고, 명령을 받을 때마다 처리한 뒤 결과를 공유 메모리에 씁니다.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    views = attach(shm.buf, n, width, height)
+    try:
+        envs = range(start, stop)
+        engines = {i: TetrisEngine(width=width, height=height) for i in envs}
+        # 게임마다의 seed (seed가 없으면 프로세스마다 다르게)
+        rngs = {i: random.Random(None if seed is None else seed + i) for i in envs}
+        drawn = dict.fromkeys(envs)  # 공유 메모리에 마지막으로 쓴 보드의 board_version
+        boards, actions, reward, mask = views['boards'], views['actions'], views['reward'], views['mask']
+        piece, rotation, x, y = views['piece'], views['rotation'], views['x'], views['y']
+        next_piece, score, lines, game_over = views['next_piece'], views['score'], views['lines'], views['game_over']
+
+        def write(i):
+            engine = engines[i]
+            if drawn[i] != engine.board_version:
+                drawn[i] = engine.board_version
+                boards[i] = np.frombuffer(engine.cells, dtype=np.uint8).reshape(height, width)
+            shape = engine.current_shape
+            piece[i], rotation[i], x[i], y[i] = shape.index, shape.rotation, shape.x, shape.y
+            next_piece[i] = engine.next_shape.index
+            score[i], lines[i], game_over[i] = engine.score, engine.lines, engine.game_over
+
+        while True:
+            go.acquire()
+            command = views['control'][0]
+            if command == CLOSE:
+                break
+            for i in envs:
+                engine = engines[i]
+                if command == RESET:
+                    if mask[i]:
+                        engine.reset(rngs[i].getrandbits(32))
+                        drawn[i] = None
+                        reward[i] = 0
+                        write(i)
+                elif not engine.game_over:
+                    before = engine.score
+                    action = int(actions[i])
+                    engine.step(action)
+                    if action != DROP:
+                        engine.tick()
+                    reward[i] = engine.score - before
+                    write(i)
+                else:
+                    reward[i] = 0
+            done.release()
+    finally:
+        del views
+        shm.close()
+
+
+class SharedEnvPool:
+    """
+    공유 메모리로 관찰값과 액션을 주고받는 작업 프로세스 풀.
+    boards, piece, rotation, x, y, next_piece, score, lines, game_over는 공유 메모리의 NumPy 뷰이며,
+    step()/reset()이 돌아온 뒤에 읽으면 됩니다. 다음 step()에서 덮어쓰므로 남겨 둘 값은 복사해야 합니다.
+    """
+    def __init__(self, n, workers=None, seed=None, width=GRID_WIDTH, height=GRID_HEIGHT):
+        self.n = n
+        self.width = width
+        self.height = height
+        workers = max(1, min(n, workers or os.cpu_count() or 1))
+        _, size = layout(n, width, height)
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        for name, view in attach(self.shm.buf, n, width, height).items():
+            setattr(self, name, view)
+        context = multiprocessing.get_context()
+        self.done = context.Semaphore(0)
+        self.go = []
+        self.processes = []
+        for w in range(workers):
+            go = context.Semaphore(0)
+            process = context.Process(target=worker_main, daemon=True,
+                                      args=(self.shm.name, n, width, height, n * w // workers,
+                                            n * (w + 1) // workers, seed, go, self.done))
+            process.start()
+            self.go.append(go)
+            self.processes.append(process)
+        self.reset()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def run(self, command):
+        """
+        모든 작업 프로세스에 명령을 보내고 모두 끝날 때까지 기다리는 함수.
+        작업 프로세스가 죽었으면 영원히 기다리지 않고 RuntimeError를 냅니다.
+        """
+        self.control[0] = command
+        for go in self.go:
+            go.release()
+        for _ in self.processes:
+            while not self.done.acquire(timeout=POLL_INTERVAL):
+                if not all(process.is_alive() for process in self.processes):
+                    raise RuntimeError("Environment worker died")
+
+    def step(self, actions):
+        """
+        환경마다 액션 하나를 적용하고 중력 한 번을 적용하는 함수. (점수 증가량, 게임 종료 여부) 뷰를 반환합니다.
+        """
+        self.actions[:] = actions
+        self.run(STEP)
+        return self.reward, self.game_over
+
+    def reset(self, mask=None):
+        """
+        환경을 새 게임으로 시작하는 함수. mask가 있으면 True인 환경만 다시 시작합니다.
+        """
+        self.mask[:] = True if mask is None else mask
+        self.run(RESET)
+
+    def occupancy(self):
+        """
+        환경별 점유 여부를 (N, 높이, 너비) bool 배열로 반환하는 함수.
+        """
+        return self.boards != 0
+
+    def close(self):
+        """
+        작업 프로세스를 끝내고 공유 메모리를 해제하는 함수.
+        """
+        if self.shm is None:
+            return
+        self.control[0] = CLOSE
+        for go in self.go:
+            go.release()
+        for process in self.processes:
+            process.join(timeout=POLL_INTERVAL)
+            if process.is_alive():
+                process.terminate()
+        for name, *_ in layout(0, 0, 0)[0]:
+            delattr(self, name)
+        self.shm.unlink()
+        try:
+            self.shm.close()
+        except BufferError:
+            pass  # 밖에서 아직 뷰를 들고 있으면 그 뷰가 사라질 때 해제됨
+        self.shm = None
+
+
+def benchmark(workers=None, n=64, steps=2000, seed=0):
+    """
+    무작위 액션으로 steps번 진행하며 초당 환경 스텝 수를 출력하는 함수.
+    """
+    rng = np.random.default_rng(seed)
+    with SharedEnvPool(n, workers, seed) as pool:
+        start = time.perf_counter()
+        games = 0
+        for _ in range(steps):
+            _, game_over = pool.step(rng.integers(0, DROP + 1, n, dtype=np.uint8))
+            if game_over.any():
+                games += int(game_over.sum())
+                pool.reset(game_over)
+        elapsed = time.perf_counter() - start
+        print(f"{len(pool.processes)} workers x {n} envs: {n * steps / elapsed:.0f} env steps/s, "
+              f"{games} games finished")
+
+
+if __name__ == "__main__":
+    benchmark(*(int(arg) for arg in sys.argv[1:4]))
@@ -0,0 +1,367 @@
+"""
+관전자/원격 화면용 게임 상태 스트림 모듈.
+매 틱 전체 보드를 보내지 않고, 바뀐 줄과 떨어지는 블록의 움직임만 작은 바이너리 프레임으로 보냅니다.
+중간에 들어온 관전자도 화면을 맞출 수 있도록 일정 프레임마다 전체 상태(키프레임)를 보냅니다.
+
+프레임 형식 (정수는 replay.py와 같은 varint):
+  길이, 플래그(1바이트), 그리고 플래그에 따라
+  KEYFRAME: 보드 너비, 높이 (뒤따르는 ROWS에 모든 줄이 들어 있음)
+  PIECE:    (블록 | 회전 << 3 | 다음 블록 << 5) 1바이트, x, y
+  MOVE:     ((dx + 4) | dy << 3 | 회전 변화 << 6) 1바이트 (블록 종류가 같고 -4 <= dx <= 3, 0 <= dy <= 7일 때)
+  SCORE:    점수, 지운 줄 수, 고정된 블록 수
+  ROWS:     줄 수, 줄마다 (y << 1 | 복사 여부) 다음에
+            복사면 이전 보드의 줄 번호 (줄을 지워 아래로 밀린 줄), 아니면 비트마스크와 채워진 칸의 블록 번호(4비트씩)
+  OVER:     게임 종료 (내용 없음)
+
+사용법: python stream.py [게임 수]  (무작위 게임을 인코딩/디코딩하여 확인하고 틱당 바이트 수를 출력)
+"""
+import random
+import sys
+
+from engine import TetrisEngine, GRID_WIDTH, GRID_HEIGHT, Piece, NOOP, DROP, spawn_columns
+from replay import write_varint, read_varint
+
+# 프레임 플래그
+KEYFRAME = 0x01
+PIECE = 0x02
+MOVE = 0x04
+SCORE = 0x08
+ROWS = 0x10
+OVER = 0x20
+
+# 키프레임 간격 (encode() 호출 수)
+KEYFRAME_INTERVAL = 300
+
+
+def write_row(out, cells, start, width):
+    """
+    cells[start:start + width] 줄을 비트마스크와 채워진 칸의 블록 번호(4비트씩)로 추가하는 함수.
+    """
+    mask = 0
+    ids = []
+    for x in range(width):
+        cell = cells[start + x]
+        if cell:
+            mask |= 1 << x
+            ids.append(cell)
+    write_varint(out, mask)
+    for i in range(0, len(ids), 2):
+        out.append(ids[i] | (ids[i + 1] << 4 if i + 1 < len(ids) else 0))
+
+
+def read_row(data, pos, cells, start, width):
+    """
+    write_row로 쓴 줄 하나를 cells[start:start + width]에 읽어 들이고 다음 위치를 반환하는 함수.
+    """
+    mask, pos = read_varint(data, pos)
+    high = False
+    for x in range(width):
+        if mask >> x & 1:
+            if high:
+                cells[start + x] = data[pos] >> 4
+                pos += 1
+            else:
+                cells[start + x] = data[pos] & 0x0F
+            high = not high
+        else:
+            cells[start + x] = 0
+    return pos + high
+
+
+class StreamEncoder:
+    """
+    엔진 상태를 지난번 encode() 이후 바뀐 부분만 프레임으로 만드는 클래스.
+    보드는 board_version이 바뀌었을 때만 줄 단위로 비교합니다.
+    """
+    def __init__(self, engine, keyframe_interval=KEYFRAME_INTERVAL):
+        self.engine = engine
+        self.keyframe_interval = keyframe_interval
+        self.count = 0          # 지난 키프레임 이후 encode() 호출 수
+        self.cells = None       # 지난 프레임 시점의 보드
+        self.stack = 0          # 지난 프레임 시점의 가장 높은 열 높이
+        self.board_version = None
+        self.piece = None
+        self.next_index = None
+        self.totals = None      # (점수, 줄 수, 블록 수)
+        self.game_over = False
+
+    def keyframe(self):
+        """
+        전체 상태를 담은 키프레임을 만드는 함수. 새 관전자에게는 이것부터 보냅니다.
+        """
+        engine = self.engine
+        body = bytearray([KEYFRAME | PIECE | SCORE | ROWS | (OVER if engine.game_over else 0)])
+        width = engine.width
+        write_varint(body, width)
+        write_varint(body, engine.height)
+        self.write_piece(body)
+        self.write_totals(body)
+        write_varint(body, engine.height)
+        for y in range(engine.height):
+            write_varint(body, y << 1)
+            write_row(body, engine.cells, y * width, width)
+        self.remember()
+        self.count = 0
+        return self.frame(body)
+
+    def encode(self):
+        """
+        지난 프레임 이후 바뀐 부분을 프레임으로 만드는 함수. 바뀐 것이 없으면 b''를 반환합니다.
+        """
+        self.count += 1
+        if self.cells is None or self.count >= self.keyframe_interval:
+            return self.keyframe()
+        engine = self.engine
+        body = bytearray(1)
+        flags = 0
+
+        piece = engine.current_shape
+        if piece != self.piece or engine.next_shape.index != self.next_index:
+            previous = self.piece
+            dx = piece.x - previous.x
+            dy = piece.y - previous.y
+            if (piece.index == previous.index and engine.next_shape.index == self.next_index and
+                    -4 <= dx <= 3 and 0 <= dy <= 7):
+                flags |= MOVE
+                body.append((dx + 4) | dy << 3 | ((piece.rotation - previous.rotation) & 3) << 6)
+            else:
+                flags |= PIECE
+                self.write_piece(body)
+
+        totals = (engine.score, engine.lines, engine.pieces)
+        if totals != self.totals:
+            flags |= SCORE
+            self.write_totals(body)
+
+        if engine.board_version != self.board_version:
+            rows = self.changed_rows()
+            if rows:
+                flags |= ROWS
+                body += rows
+
+        if engine.game_over:
+            flags |= OVER
+        if not flags or flags == OVER and self.game_over:
+            self.remember()
+            return b''
+        body[0] = flags
+        self.remember()
+        return self.frame(body)
+
+    def changed_rows(self):
+        """
+        지난 프레임과 달라진 줄들을 ROWS 형식으로 만드는 함수.
+        줄을 지워 아래로 밀린 줄은 이전 보드의 같은 내용 줄을 가리키는 것으로 대신합니다.
+        이전 보드와 지금 보드 모두 쌓인 부분보다 위는 빈 줄이므로 쌓인 부분만 비교합니다.
+        """
+        engine = self.engine
+        cells = engine.cells
+        old = self.cells
+        width = engine.width
+        height = engine.height
+        top = height - max(self.stack, max(engine.heights))
+        previous = {}           # 이전 보드의 줄 내용 -> 줄 번호 (빈 줄 제외)
+        for y in range(top, height):
+            row = old[y * width:(y + 1) * width]
+            if any(row):
+                previous.setdefault(row, y)
+        out = bytearray()
+        count = 0
+        for y in range(top, height):
+            start = y * width
+            row = bytes(cells[start:start + width])
+            if row == old[start:start + width]:
+                continue
+            count += 1
+            source = previous.get(row)
+            if source is not None:
+                write_varint(out, y << 1 | 1)
+                write_varint(out, source)
+            else:
+                write_varint(out, y << 1)
+                write_row(out, cells, start, width)
+        if not count:
+            return b''
+        head = bytearray()
+        write_varint(head, count)
+        return head + out
+
+    def write_piece(self, out):
+        """
+        현재 블록과 다음 블록을 PIECE 형식으로 추가하는 함수.
+        """
+        engine = self.engine
+        piece = engine.current_shape
+        out.append(piece.index | piece.rotation << 3 | engine.next_shape.index << 5)
+        write_varint(out, piece.x)
+        write_varint(out, piece.y)
+
+    def write_totals(self, out):
+        """
+        점수, 지운 줄 수, 고정된 블록 수를 추가하는 함수.
+        """
+        engine = self.engine
+        write_varint(out, engine.score)
+        write_varint(out, engine.lines)
+        write_varint(out, engine.pieces)
+
+    def remember(self):
+        """
+        다음 프레임과 비교할 수 있도록 지금 상태를 저장하는 함수.
+        """
+        engine = self.engine
+        if engine.board_version != self.board_version:
+            self.cells = bytes(engine.cells)
+            self.stack = max(engine.heights)
+            self.board_version = engine.board_version
+        self.piece = engine.current_shape
+        self.next_index = engine.next_shape.index
+        self.totals = (engine.score, engine.lines, engine.pieces)
+        self.game_over = engine.game_over
+
+    @staticmethod
+    def frame(body):
+        """
+        프레임 앞에 길이를 붙이는 함수.
+        """
+        out = bytearray()
+        write_varint(out, len(body))
+        return bytes(out + body)
+
+
+class StreamDecoder:
+    """
+    스트림 프레임으로 게임 상태를 다시 만드는 클래스.
+    cells, board_version, current_shape, next_shape를 엔진과 같은 이름으로 가지므로 BoardRenderer로 바로 그릴 수 있습니다.
+    첫 키프레임을 받기 전의 프레임은 건너뜁니다.
+    """
+    def __init__(self):
+        self.buffer = bytearray()
+        self.synced = False
+        self.width = GRID_WIDTH
+        self.height = GRID_HEIGHT
+        self.cells = bytearray(GRID_WIDTH * GRID_HEIGHT)
+        self.spawn_x = spawn_columns(GRID_WIDTH)
+        self.board_version = 0
+        self.current_shape = None
+        self.next_shape = None
+        self.score = 0
+        self.lines = 0
+        self.pieces = 0
+        self.game_over = False
+
+    @property
+    def rows(self):
+        """줄별 비트마스크 (엔진의 rows와 같은 값)."""
+        width = self.width
+        return [sum(1 << x for x in range(width) if self.cells[y * width + x]) for y in range(self.height)]
+
+    def feed(self, data):
+        """
+        받은 바이트를 넣고 완성된 프레임들을 적용하는 함수. 적용한 프레임 수를 반환합니다.
+        """
+        buffer = self.buffer
+        buffer += data
+        pos = 0
+        applied = 0
+        while pos < len(buffer):
+            try:
+                length, start = read_varint(buffer, pos)
+            except IndexError:
+                break
+            if start + length > len(buffer):
+                break
+            self.apply(bytes(buffer[start:start + length]))
+            pos = start + length
+            applied += 1
+        del buffer[:pos]
+        return applied
+
+    def apply(self, body):
+        """
+        프레임 하나(길이 제외)를 적용하는 함수.
+        """
+        flags = body[0]
+        pos = 1
+        if flags & KEYFRAME:
+            self.width, pos = read_varint(body, pos)
+            self.height, pos = read_varint(body, pos)
+            self.cells = bytearray(self.width * self.height)
+            self.spawn_x = spawn_columns(self.width)
+            self.synced = True
+        elif not self.synced:
+            return
+
+        if flags & PIECE:
+            packed = body[pos]
+            x, pos = read_varint(body, pos + 1)
+            y, pos = read_varint(body, pos)
+            self.current_shape = Piece(packed & 7, packed >> 3 & 3, x, y)
+            next_index = packed >> 5
+            self.next_shape = Piece(next_index, 0, self.spawn_x[next_index], 0)
+        elif flags & MOVE:
+            packed = body[pos]
+            pos += 1
+            piece = self.current_shape
+            self.current_shape = Piece(piece.index, (piece.rotation + (packed >> 6)) & 3,
+                                       piece.x + (packed & 7) - 4, piece.y + (packed >> 3 & 7))
+
+        if flags & SCORE:
+            self.score, pos = read_varint(body, pos)
+            self.lines, pos = read_varint(body, pos)
+            self.pieces, pos = read_varint(body, pos)
+
+        if flags & ROWS:
+            width = self.width
+            old = bytes(self.cells)
+            count, pos = read_varint(body, pos)
+            for _ in range(count):
+                value, pos = read_varint(body, pos)
+                start = (value >> 1) * width
+                if value & 1:
+                    source, pos = read_varint(body, pos)
+                    self.cells[start:start + width] = old[source * width:(source + 1) * width]
+                else:
+                    pos = read_row(body, pos, self.cells, start, width)
+            self.board_version += 1
+
+        self.game_over = bool(flags & OVER)
+
+
+def check_stream(games=20, seed=0, max_ticks=20000):
+    """
+    무작위 액션으로 게임을 진행하며 매 틱 인코딩/디코딩한 상태가 엔진과 같은지 확인하고 틱당 바이트 수를 출력하는 함수.
+    """
+    rng = random.Random(seed)
+    total_bytes = total_ticks = keyframe_bytes = 0
+    for game in range(games):
+        engine = TetrisEngine(seed=seed + game)
+        encoder = StreamEncoder(engine)
+        decoder = StreamDecoder()
+        keyframe_bytes += len(encoder.keyframe())
+        decoder.feed(encoder.keyframe())
+        while not engine.game_over and engine.ticks < max_ticks:
+            for _ in range(rng.randrange(3)):
+                action = rng.choice((NOOP, 1, 2, 3, 4, DROP, 1, 2, 4))
+                engine.step(action)
+            engine.tick()
+            frame = encoder.encode()
+            total_bytes += len(frame)
+            total_ticks += 1
+            # 여러 조각으로 나뉘어 도착해도 같은 결과가 나와야 함
+            for i in range(0, len(frame), 3):
+                decoder.feed(frame[i:i + 3])
+            state = (engine.cells, engine.current_shape, engine.next_shape.index,
+                     engine.score, engine.lines, engine.pieces, engine.game_over)
+            decoded = (decoder.cells, decoder.current_shape, decoder.next_shape.index,
+                       decoder.score, decoder.lines, decoder.pieces, decoder.game_over)
+            if state != decoded:
+                print(f"game {game} tick {engine.ticks}: decoded state differs")
+                return False
+    print(f"{games} games, {total_ticks} ticks: {total_bytes / total_ticks:.2f} bytes/tick, "
+          f"keyframe {keyframe_bytes / games:.0f} bytes, full board {GRID_WIDTH * GRID_HEIGHT * 3} bytes as RGB")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if check_stream(int(sys.argv[1]) if len(sys.argv) > 1 else 20) else 1)
@@ -0,0 +1,196 @@
+"""
+게임 플레이 기록(텔레메트리) 모듈.
+블록 고정, 속도 변경, 게임 종료 이벤트를 미리 할당한 열(array)별 링 버퍼에 숫자로만 기록하고,
+백그라운드 스레드가 일정 시간마다 모아서 파일에 씁니다. 게임 루프에서는 문자열을 만들거나 파일을 쓰지 않습니다.
+기록하는 스레드(게임 루프)는 하나이고, 쓴 개수와 파일에 쓴 개수 카운터만 주고받으므로 잠금이 필요 없습니다.
+버퍼가 가득 차면(파일 쓰기가 밀리면) 새 이벤트는 버리고 버린 개수를 셉니다.
+
+파일 형식:
+  헤더: b'TTEL', 버전(1바이트), 열 수(1바이트), 열마다 array 형식 문자(1바이트)
+  묶음: 이벤트 수, 지금까지 버린 이벤트 수 (각 4바이트), 그 뒤에 열마다 이벤트 수만큼의 값 (array.tobytes)
+
+사용법: python telemetry.py 기록파일...
+"""
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+
+MAGIC = b'TTEL'
+VERSION = 1
+HEADER = struct.Struct('<4sBB')
+BATCH = struct.Struct('<II')
+
+# 이벤트 종류
+LOCK = 0        # 블록 고정 (value 없음)
+SPEED = 1       # 속도 변경 (value: 중력 간격 밀리초)
+GAME_OVER = 2   # 게임 종료 (value: 최종 점수)
+KINDS = ('lock', 'speed', 'game_over')
+
+# (열 이름, array 형식) - record()의 인자 순서와 같음
+# 형식 문자는 파일 헤더에 함께 저장되므로, 형식을 바꿔도 load()는 예전 파일을 그대로 읽습니다.
+FIELDS = (
+    ('kind', 'B'),
+    ('piece', 'H'),         # 블록 번호 (0~6)
+    ('rotation', 'H'),
+    ('column', 'i'),        # 블록의 x 위치 (보드 너비는 수천 칸까지 가능)
+    ('tick', 'I'),          # 고정된 시점의 중력 횟수
+    ('lines', 'B'),         # 지운 줄 수
+    ('score_delta', 'I'),
+    ('frame_us', 'I'),      # 직전 프레임에 걸린 시간 (마이크로초)
+    ('value', 'i'),
+)
+FIELD_NAMES = tuple(name for name, _ in FIELDS)
+
+# 기록 파일을 저장하는 폴더
+TELEMETRY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'telemetry')
+
+
+class Telemetry:
+    """
+    이벤트를 열별 링 버퍼에 모으고 백그라운드 스레드로 파일에 쓰는 클래스.
+    enabled가 거짓이면 스레드를 만들지 않고 record()는 아무것도 하지 않습니다.
+    파일은 처음 쓸 이벤트가 생겼을 때 flush 스레드에서 만듭니다.
+    """
+    def __init__(self, path=None, capacity=4096, flush_interval=1.0, enabled=True):
+        self.path = path
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.enabled = enabled
+        self.columns = [array(code, bytes(array(code).itemsize * capacity)) for _, code in FIELDS]
+        self.written = 0        # 지금까지 기록한 이벤트 수 (게임 루프만 증가시킴)
+        self.flushed = 0        # 지금까지 파일에 쓴 이벤트 수 (flush 스레드만 증가시킴)
+        self.dropped = 0        # 버퍼가 가득 차서 버린 이벤트 수
+        self.file = None
+        self.wake = threading.Event()
+        self.stopping = False
+        self.thread = None
+        if enabled:
+            self.thread = threading.Thread(target=self.flush_loop, name='telemetry', daemon=True)
+            self.thread.start()
+
+    def record(self, kind, piece=0, rotation=0, column=0, tick=0, lines=0, score_delta=0, frame_us=0, value=0):
+        """
+        이벤트 하나를 링 버퍼에 기록하는 함수 (게임 루프에서 부름).
+        """
+        if not self.enabled:
+            return
+        written = self.written
+        pending = written - self.flushed
+        if pending >= self.capacity:
+            self.dropped += 1
+            return
+        i = written % self.capacity
+        c = self.columns
+        c[0][i] = kind
+        c[1][i] = piece
+        c[2][i] = rotation
+        c[3][i] = column
+        c[4][i] = tick
+        c[5][i] = lines
+        c[6][i] = score_delta
+        c[7][i] = frame_us
+        c[8][i] = value
+        self.written = written + 1
+        # 버퍼가 절반을 넘으면 기다리지 않고 바로 쓰도록 깨움
+        if pending * 2 >= self.capacity:
+            self.wake.set()
+
+    def flush_loop(self):
+        """
+        flush_interval마다(또는 버퍼가 절반을 넘으면) 쌓인 이벤트를 파일에 쓰는 스레드 함수.
+        """
+        while not self.stopping:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            self.flush()
+        self.flush()
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def flush(self):
+        """
+        아직 쓰지 않은 이벤트를 한 묶음으로 파일에 쓰는 함수 (flush 스레드에서 부름).
+        """
+        start, end = self.flushed, self.written
+        if start == end:
+            return
+        if self.file is None:
+            self.open()
+        first, last = start % self.capacity, end % self.capacity
+        chunks = [BATCH.pack(end - start, self.dropped)]
+        for column in self.columns:
+            if first < last:
+                chunks.append(column[first:last].tobytes())
+            else:
+                chunks.append(column[first:].tobytes() + column[:last].tobytes())
+        self.file.write(b''.join(chunks))
+        self.file.flush()
+        self.flushed = end
+
+    def open(self):
+        """
+        기록 파일을 만들고 헤더를 쓰는 함수. 경로가 없으면 telemetry 폴더에 시간으로 이름을 붙입니다.
+        """
+        if self.path is None:
+            os.makedirs(TELEMETRY_DIR, exist_ok=True)
+            self.path = os.path.join(TELEMETRY_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.ttl")
+        self.file = open(self.path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, len(FIELDS)) + ''.join(code for _, code in FIELDS).encode())
+
+    def close(self):
+        """
+        남은 이벤트를 모두 쓰고 flush 스레드를 끝내는 함수.
+        """
+        if self.thread:
+            self.stopping = True
+            self.wake.set()
+            self.thread.join()
+            self.thread = None
+
+
+def load(path):
+    """
+    기록 파일을 읽어 (열 이름 -> array 사전, 버린 이벤트 수)를 반환하는 함수.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION or count != len(FIELDS):
+        raise ValueError("Not a Tetris telemetry file")
+    pos = HEADER.size
+    codes = data[pos:pos + count].decode()
+    pos += count
+    columns = {name: array(code) for name, code in zip(FIELD_NAMES, codes)}
+    dropped = 0
+    while pos < len(data):
+        events, dropped = BATCH.unpack_from(data, pos)
+        pos += BATCH.size
+        for name, column in columns.items():
+            size = events * column.itemsize
+            column.frombytes(data[pos:pos + size])
+            pos += size
+    return columns, dropped
+
+
+def summarize(paths):
+    """
+    기록 파일마다 이벤트 수, 블록/줄/점수 합계, 프레임 시간(p50/p99)을 출력하는 함수.
+    """
+    for path in paths:
+        columns, dropped = load(path)
+        kinds = columns['kind']
+        locks = [i for i, kind in enumerate(kinds) if kind == LOCK]
+        frame_us = sorted(columns['frame_us'][i] for i in locks)
+        counts = ' '.join(f"{name}={kinds.count(kind)}" for kind, name in enumerate(KINDS))
+        p50 = frame_us[len(frame_us) // 2] if frame_us else 0
+        p99 = frame_us[min(len(frame_us) - 1, len(frame_us) * 99 // 100)] if frame_us else 0
+        print(f"{path}: {counts} dropped={dropped} lines={sum(columns['lines'])} "
+              f"score={sum(columns['score_delta'])} frame_us p50={p50} p99={p99}")
+
+
+if __name__ == "__main__":
+    summarize(sys.argv[1:])
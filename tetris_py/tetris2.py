@@ -1,15 +1,34 @@
+import math
+import os
+import sys
+import time
+
 import pygame
-import random
 
-# Initialize Pygame
-pygame.init()
+from controls import KeyRepeat, default_bindings
+from engine import TetrisEngine, GRID_WIDTH, GRID_HEIGHT, DROP
+from profiler import FrameProfiler
+from render import BoardRenderer, fit_board, open_window, get_font, render_text
+from replay import ReplayRecorder
+from telemetry import Telemetry, LOCK, SPEED, GAME_OVER
 
 # Screen dimensions
 SCREEN_WIDTH = 500  # 오른쪽에 버튼 공간 추가
 SCREEN_HEIGHT = 600
 GRID_SIZE = 30
-GRID_WIDTH = 10  # 게임 그리드의 너비
-GRID_HEIGHT = SCREEN_HEIGHT // GRID_SIZE
+# 보드를 그리는 영역 (왼쪽 위). 보드가 크면 칸 크기를 줄여 맞추고, 그래도 안 되면 블록을 따라 스크롤
+BOARD_AREA_WIDTH = GRID_WIDTH * GRID_SIZE
+BOARD_AREA_HEIGHT = GRID_HEIGHT * GRID_SIZE
+
+# 게임 로직은 화면과 상관없이 고정 시간 간격(LOGIC_HZ)으로 진행하고, 화면은 FPS만큼만 그림
+LOGIC_HZ = 240
+LOGIC_STEP = 1000 / LOGIC_HZ  # 밀리초
+FPS = 60
+# 창을 옮기는 등으로 오래 멈췄을 때 한 번에 따라잡는 최대 로직 시간 (밀리초)
+# 할 일이 없으면 다음 중력까지(가장 느린 속도에서 500ms) 잠들므로 그보다 길어야 함
+MAX_CATCHUP = 1000
+# 다음 블록과 점수를 그리는 영역 (오른쪽 위)
+HUD_RECT = pygame.Rect(BOARD_AREA_WIDTH, 0, SCREEN_WIDTH - BOARD_AREA_WIDTH, 200)
 
 # Colors
 BLACK = (0, 0, 0)
@@ -22,17 +41,6 @@ MAGENTA = (255, 0, 255)
 YELLOW = (255, 255, 0)
 ORANGE = (255, 165, 0)
 
-# Shapes
-SHAPES = [
-    [[1, 1, 1, 1]],  # I
-    [[1, 1], [1, 1]],  # O
-    [[0, 1, 0], [1, 1, 1]],  # T
-    [[1, 0, 0], [1, 1, 1]],  # L
-    [[0, 0, 1], [1, 1, 1]],  # J
-    [[0, 1, 1], [1, 1, 0]],  # S
-    [[1, 1, 0], [0, 1, 1]]   # Z
-]
-
 # Assign colors to specific shapes
 SHAPE_COLORS = {
     0: CYAN,     # I
@@ -45,6 +53,8 @@ SHAPE_COLORS = {
 }
 # Shape colors
 SHAPE_COLORS = [CYAN, YELLOW, MAGENTA, ORANGE, BLUE, GREEN, RED]
+# 엔진의 블록 번호 -> 색상 (0번은 빈 칸)
+PALETTE = [BLACK] + SHAPE_COLORS
 
 class Button:
     """
@@ -57,18 +67,22 @@ class Button:
         self.hover_color = hover_color
         self.action = action
 
+    def hovered(self):
+        """
+        마우스가 버튼 위에 있는지 확인하는 함수
+        """
+        return self.rect.collidepoint(pygame.mouse.get_pos())
+
     def draw(self, screen):
         """
         버튼을 화면에 그리는 함수
         """
-        mouse_pos = pygame.mouse.get_pos()
-        if self.rect.collidepoint(mouse_pos):
+        if self.hovered():
             pygame.draw.rect(screen, self.hover_color, self.rect)
         else:
             pygame.draw.rect(screen, self.color, self.rect)
 
-        font = pygame.font.SysFont(None, 24)
-        text_surf = font.render(self.text, True, WHITE)
+        text_surf = render_text(self.text, 24, WHITE)
         text_rect = text_surf.get_rect(center=self.rect.center)
         screen.blit(text_surf, text_rect)
 
@@ -85,19 +99,32 @@ class Tetris:
     """
     테트리스 게임 클래스는 게임 로직을 관리합니다.
     """
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Tetris")
-        self.clock = pygame.time.Clock()
-        self.grid = [[BLACK for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
-        self.current_shape = None
-        self.next_shape = self.get_new_shape()
-        self.score = 0
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT):
+        self.screen = open_window(SCREEN_WIDTH, SCREEN_HEIGHT, "Tetris")
+        size, columns, rows = fit_board(BOARD_AREA_WIDTH, BOARD_AREA_HEIGHT, width, height, GRID_SIZE)
+        self.renderer = BoardRenderer(PALETTE, size, columns=columns, rows=rows)  # 보드/블록 타일 캐시
+        # 다음 블록 미리보기는 보드 칸 크기와 상관없이 기본 크기로 그림
+        self.preview = self.renderer if size == GRID_SIZE else BoardRenderer(PALETTE, GRID_SIZE)
+        self.engine = TetrisEngine(width=width, height=height)  # 게임 규칙은 엔진이 담당
+        self.recorder = None          # 진행 중인 게임의 리플레이 기록
+        # 프레임 단계별 시간 측정 (TETRIS_PROFILE=1 이면 처음부터 켜짐, F3: 성능 표시, F4: CSV 저장)
+        self.profiler = FrameProfiler(enabled=bool(os.environ.get('TETRIS_PROFILE')))
+        # 블록 고정/속도 변경 기록 (TETRIS_TELEMETRY=0 이면 끔)
+        self.telemetry = Telemetry(enabled=os.environ.get('TETRIS_TELEMETRY', '1') != '0')
+        self.frame_us = 0        # 직전 루프 한 번에 걸린 시간 (마이크로초, 기록용)
         self.game_over = False
         self.drop_speed = 500  # 블록이 떨어지는 속도 (밀리초)
-        self.drop_time = pygame.time.get_ticks()
-        self.move_time = 0  # 마지막 키 입력 시간
-        self.move_delay = 150  # 키보드 입력 간 딜레이 (밀리초)
+        self.drop_timer = 0.0  # 마지막 중력 이후 흐른 로직 시간 (밀리초)
+        # 좌우/아래 키는 누르면 바로 한 번, 150ms(DAS) 뒤부터 50ms(ARR)마다 반복
+        self.controls = KeyRepeat(default_bindings(pygame), das=150, arr=50)
+        self.sim_time = 0.0      # 로직 시간 (밀리초, 고정 간격으로만 증가)
+        self.accumulator = 0.0   # 아직 로직에 반영하지 않은 실제 시간 (밀리초)
+        self.last_time = None    # 직전 루프의 실제 시간 (밀리초)
+        self.next_render = 0.0   # 다음에 화면을 그릴 실제 시간 (밀리초)
+        self.render_pending = False  # FPS 제한 때문에 아직 그리지 못한 변경이 있을 수 있는지
+        self.drawn = {}          # 마지막으로 그린 화면의 영역별 상태 (바뀐 영역만 다시 보내기 위해)
+        self.full_redraw = True  # 다음 화면은 전체를 다시 보냄 (처음, 창이 다시 보일 때)
+        self.pending_event = None  # 대기 중에 받아 두었다가 handle_events()에서 처리할 이벤트
         self.game_started = False  # 게임 시작 여부
         self.create_buttons()
 
@@ -124,7 +151,7 @@ class Tetris:
         속도를 설정하는 함수. 선택된 속도에 따라 게임의 drop_speed를 설정합니다.
         """
         self.drop_speed = speed  # 블록이 떨어지는 속도 설정
-        print(f"Speed set to {speed}ms per block drop.")
+        self.telemetry.record(SPEED, value=speed)
 
     def toggle_pause(self):
         """
@@ -136,6 +163,7 @@ class Tetris:
         else:
             self.paused = True
             self.pause_button.text = "Resume"
+        self.controls.clear()
 
     def start_game(self):
         """
@@ -143,11 +171,10 @@ class Tetris:
         """
         if not self.game_started:  # 게임이 시작 중이 아니면 새 게임 시작
             self.game_over = False  # 게임 종료 상태 해제
-            self.score = 0          # 점수 초기화
-            self.grid = [[BLACK for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]  # 그리드 초기화
-            self.current_shape = self.get_new_shape()  # 새로운 블록 생성
-            self.next_shape = self.get_new_shape()     # 다음 블록 생성
-            self.drop_time = pygame.time.get_ticks()   # 블록 낙하 시간 초기화
+            self.engine.reset()     # 그리드, 점수, 블록 초기화 (게임마다 새 seed)
+            self.recorder = ReplayRecorder(self.engine)  # 입력은 기록기를 거쳐 엔진에 전달
+            self.drop_timer = 0.0                      # 블록 낙하 시간 초기화
+            self.controls.clear()
             self.game_started = True                   # 게임이 시작됨을 표시
             self.paused = False
 
@@ -169,65 +196,52 @@ class Tetris:
         self.game_started = False
         self.game_over = True
         self.pause_button = None  # 게임 종료 시 Pause/Resume 버튼 제거
+        self.save_replay()
 
-    def get_new_shape(self):
+    def save_replay(self):
         """
-        랜덤한 블록과 그에 대응하는 고유한 색상을 반환하는 함수.
+        진행 중이던 게임의 리플레이를 replays 폴더에 저장하는 함수.
         """
-        shape_index = random.randint(0, len(SHAPES) - 1)  # 블록 모양을 랜덤으로 선택
-        shape = SHAPES[shape_index]
-        color = SHAPE_COLORS[shape_index]  # 선택된 블록에 해당하는 색상
-        return {'shape': shape, 'color': color, 'x': GRID_WIDTH // 2 - len(shape[0]) // 2, 'y': 0}
+        if self.recorder:
+            path = self.recorder.save()
+            print(f"Replay saved to {path}")
+            self.recorder = None
 
     def draw_grid(self):
         """
         게임 그리드를 화면에 그리는 함수.
         """
-        for y in range(GRID_HEIGHT):
-            for x in range(GRID_WIDTH):
-                pygame.draw.rect(self.screen, self.grid[y][x], (x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE), 0)
-                pygame.draw.rect(self.screen, WHITE, (x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE), 1)
+        self.renderer.draw_board(self.screen, self.engine)
 
     def draw_border(self):
         """
         테두리를 그리는 함수. 그리드의 바깥쪽 테두리를 그립니다.
         """
-        border_rect = pygame.Rect(0, 0, GRID_WIDTH * GRID_SIZE, GRID_HEIGHT * GRID_SIZE)
+        border_rect = self.renderer.background.get_rect()
         pygame.draw.rect(self.screen, WHITE, border_rect, 5)  # 테두리를 그리며, 두께는 5px
 
     def draw_shape(self, shape):
         """
         현재 블록을 화면에 그리는 함수.
         """
-        for y, row in enumerate(shape['shape']):
-            for x, cell in enumerate(row):
-                if cell:
-                    pygame.draw.rect(self.screen, shape['color'], ((shape['x'] + x) * GRID_SIZE, (shape['y'] + y) * GRID_SIZE, GRID_SIZE, GRID_SIZE), 0)
-                    pygame.draw.rect(self.screen, WHITE, ((shape['x'] + x) * GRID_SIZE, (shape['y'] + y) * GRID_SIZE, GRID_SIZE, GRID_SIZE), 1)
+        self.renderer.draw_piece(self.screen, shape)
 
     def draw_next_shape_and_score(self):
         """
         다음에 나올 블록과 점수를 오른쪽 상단에 그리는 함수.
         """
-        next_shape_x = GRID_WIDTH * GRID_SIZE + 20  # 오른쪽 그리드 공간의 시작 위치
+        next_shape_x = BOARD_AREA_WIDTH + 20  # 오른쪽 그리드 공간의 시작 위치
         next_shape_y = 50  # 상단에서의 위치
-        font = pygame.font.SysFont(None, 36)
 
         # "Next" 텍스트 표시
-        next_text = font.render("Next:", True, WHITE)
+        next_text = render_text("Next:", 36, WHITE)
         self.screen.blit(next_text, (next_shape_x, next_shape_y - 40))
 
         # 다음에 나올 블록 표시
-        shape = self.next_shape['shape']
-        color = self.next_shape['color']
-        for y, row in enumerate(shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    pygame.draw.rect(self.screen, color, (next_shape_x + x * GRID_SIZE, next_shape_y + y * GRID_SIZE, GRID_SIZE, GRID_SIZE))
-                    pygame.draw.rect(self.screen, WHITE, (next_shape_x + x * GRID_SIZE, next_shape_y + y * GRID_SIZE, GRID_SIZE, GRID_SIZE), 1)
+        self.preview.draw_piece(self.screen, self.engine.next_shape, (next_shape_x, next_shape_y))
 
         # 점수 표시
-        score_text = font.render(f"Score: {self.score}", True, WHITE)
+        score_text = render_text(f"Score: {self.engine.score}", 36, WHITE)
         self.screen.blit(score_text, (next_shape_x, next_shape_y + 100))
 
     # def draw_next_shape(self):
@@ -253,194 +267,279 @@ class Tetris:
     #                 pygame.draw.rect(self.screen, WHITE, (next_shape_x + x * GRID_SIZE, next_shape_y + y * GRID_SIZE, GRID_SIZE, GRID_SIZE), 1)
 
 
-    def move_shape(self, dx, dy):
+    def on_lock(self, piece, score):
         """
-        블록을 x축(dx)과 y축(dy)으로 이동시키는 함수.
+        블록이 고정된 뒤 결과를 기록하고 게임 종료 여부를 반영하는 함수.
+        piece는 고정된 블록, score는 고정 전 점수입니다.
         """
-        self.current_shape['x'] += dx
-        self.current_shape['y'] += dy
-        if self.check_collision():
-            self.current_shape['x'] -= dx
-            self.current_shape['y'] -= dy
-            return False
-        return True
-
-    def rotate_shape(self):
-        """
-        현재 블록을 회전시키는 함수.
-        """
-        shape = self.current_shape['shape']
-        rotated_shape = [[shape[y][x] for y in range(len(shape))] for x in range(len(shape[0]) - 1, -1, -1)]
-        old_shape = self.current_shape['shape']
-        self.current_shape['shape'] = rotated_shape
-        if self.check_collision():
-            self.current_shape['shape'] = old_shape
-
-    def check_collision(self):
-        """
-        블록이 그리드 경계나 다른 블록과 충돌하는지 확인하는 함수.
-        """
-        shape = self.current_shape['shape']
-        for y, row in enumerate(shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    if (self.current_shape['x'] + x < 0 or
-                        self.current_shape['x'] + x >= GRID_WIDTH or
-                        self.current_shape['y'] + y >= GRID_HEIGHT or
-                        self.grid[self.current_shape['y'] + y][self.current_shape['x'] + x] != BLACK):
-                        return True
-        return False
-
-    def lock_shape(self):
-        """
-        현재 블록을 그리드에 고정하고 새로운 블록을 생성하는 함수.
-        """
-        shape = self.current_shape['shape']
-        for y, row in enumerate(shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    self.grid[self.current_shape['y'] + y][self.current_shape['x'] + x] = self.current_shape['color']
-        self.clear_lines()
-        self.current_shape = self.next_shape
-        self.next_shape = self.get_new_shape()
-        if self.check_collision():
+        engine = self.engine
+        self.telemetry.record(LOCK, piece.index, piece.rotation, piece.x, engine.ticks,
+                              engine.last_cleared, engine.score - score, self.frame_us)
+        if engine.game_over:
+            self.telemetry.record(GAME_OVER, tick=engine.ticks, value=engine.score)
             self.game_over = True
+            self.save_replay()
+
+    def apply_action(self, action):
+        """
+        액션 하나를 기록기를 거쳐 엔진에 적용하는 함수.
+        """
+        piece, score = self.engine.current_shape, self.engine.score
+        self.recorder.step(action)
+        if action == DROP:
+            # 스페이스바를 누르면 블록이 즉시 바닥까지 낙하하고 고정됨
+            self.on_lock(piece, score)
 
-    def clear_lines(self):
-        """
-        가득 찬 라인을 지우고 점수를 추가하는 함수. 일반적인 테트리스 점수 계산 방식으로 점수를 계산합니다.
-        """
-        lines_to_clear = [y for y in range(GRID_HEIGHT) if all(self.grid[y][x] != BLACK for x in range(GRID_WIDTH))]
-        
-        if lines_to_clear:
-            # 줄을 지운 횟수에 따라 점수를 다르게 부여
-            lines_cleared = len(lines_to_clear)
-            score_increase = {1: 100, 2: 300, 3: 500, 4: 800}.get(lines_cleared, 0)
-            self.score += score_increase
-
-            # 줄을 제거하고 빈 줄을 위로 추가
-            for y in lines_to_clear:
-                del self.grid[y]
-                self.grid.insert(0, [BLACK for _ in range(GRID_WIDTH)])
-
-            print(f"Cleared {lines_cleared} lines, Score: {self.score}")
-
-
-    def handle_input(self):
-        """
-        키보드 입력을 처리하는 함수. 좌우 이동, 회전, 아래로 이동을 관리합니다.
-        """
-        keys = pygame.key.get_pressed()
-        current_time = pygame.time.get_ticks()
-
-        # 일정 시간 간격으로만 입력 처리
-        if current_time - self.move_time > self.move_delay:
-            if keys[pygame.K_LEFT]:
-                self.move_shape(-1, 0)
-                self.move_time = current_time
-            if keys[pygame.K_RIGHT]:
-                self.move_shape(1, 0)
-                self.move_time = current_time
-            if keys[pygame.K_DOWN]:
-                self.move_shape(0, 1)
-                self.move_time = current_time
-            if keys[pygame.K_UP]:
-                self.rotate_shape()
-                self.move_time = current_time
-            if keys[pygame.K_SPACE]:
-                # 스페이스바를 누르면 블록이 즉시 바닥까지 낙하
-                while self.move_shape(0, 1):
-                    pass  # 더 이상 내려갈 수 없을 때까지 계속 아래로 이동
-                self.lock_shape()  # 바닥에 도착하면 블록을 고정
-                self.move_time = current_time  # 입력 시간 업데이트
+    def playing(self):
+        """
+        게임이 진행 중(시작됨, 종료 전, 일시정지 아님)인지 확인하는 함수.
+        """
+        return self.game_started and not self.game_over and not self.paused
+
+    def update(self, dt):
+        """
+        게임 로직을 고정 시간 간격 dt(밀리초)만큼 진행하는 함수. 키 자동 반복과 중력을 처리합니다.
+        """
+        if not self.playing():
+            return
+        self.sim_time += dt
+        for action in self.controls.update(self.sim_time):
+            self.apply_action(action)
+            if self.game_over:
+                return
+
+        # 블록이 일정 시간마다 떨어지도록 처리 (남은 시간은 다음 중력으로 넘김)
+        self.drop_timer += dt
+        if self.drop_timer >= self.drop_speed:
+            self.drop_timer -= self.drop_speed
+            piece, score = self.engine.current_shape, self.engine.score
+            if self.recorder.tick():
+                self.on_lock(piece, score)
+
+    def handle_events(self):
+        """
+        이벤트를 처리하는 함수. 키 입력은 KEYDOWN 순간 바로 적용하고, 자동 반복은 update()에서 처리합니다.
+        """
+        # 이벤트가 생긴 시각: 로직 시간에 아직 반영하지 않은 시간을 더한 값
+        now = self.sim_time + self.accumulator
+        profiler = self.profiler
+        events = pygame.event.get()
+        if self.pending_event is not None:
+            events.insert(0, self.pending_event)
+            self.pending_event = None
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.running = False  # 창을 닫기 위해서는 running을 False로 설정
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                self.full_redraw = True  # 가려졌던 창이 다시 보이면 전체를 다시 그림
+
+            if event.type == pygame.KEYDOWN:
+                # 성능 표시 (F3) 와 측정 결과 CSV 저장 (F4)
+                if event.key == pygame.K_F3:
+                    profiler.toggle_overlay()
+                elif event.key == pygame.K_F4 and profiler.count:
+                    print(f"Profile saved to {profiler.dump_csv()}")
+                elif self.playing():
+                    action = self.controls.press(event.key, now)
+                    if action is not None:
+                        self.apply_action(action)
+            elif event.type == pygame.KEYUP:
+                self.controls.release(event.key)
+
+            # 버튼 클릭 이벤트 처리
+            if self.pause_button:
+                self.pause_button.check_click(event)
+            self.start_button.check_click(event)
+            self.quit_button.check_click(event)
+
+            # 게임 시작 전 속도 선택 버튼 처리
+            if not self.game_started:
+                self.speed_button1.check_click(event)
+                self.speed_button2.check_click(event)
+                self.speed_button3.check_click(event)
+
+        # Quit 버튼을 눌렀을 때는 게임만 멈추지만 창은 계속 열려 있음
+        if self.game_over:
+            self.game_started = False  # 게임이 끝났으니 다시 시작할 수 있음
 
     def display_game_over(self):
         """
         게임 종료 시 화면에 'Game Over' 메시지를 표시하는 함수.
         """
-        font = pygame.font.SysFont(None, 48)
-        game_over_surf = font.render("Game Over", True, RED)
-        game_over_rect = game_over_surf.get_rect(center=(GRID_WIDTH * GRID_SIZE // 2, GRID_HEIGHT * GRID_SIZE // 2))
+        game_over_surf = render_text("Game Over", 48, RED)
+        game_over_rect = game_over_surf.get_rect(center=(BOARD_AREA_WIDTH // 2, BOARD_AREA_HEIGHT // 2))
         self.screen.blit(game_over_surf, game_over_rect)
 
     def run(self):
         """
         메인 게임 루프를 실행하는 함수. 게임 상태에 따라 게임을 업데이트합니다.
         """
-        running = True  # 전체 프로그램의 실행 상태를 관리
-
-        while running:  # 전체 프로그램이 실행되는 동안 계속 루프
-            current_time = pygame.time.get_ticks()
+        self.running = True  # 전체 프로그램의 실행 상태를 관리
+        # 시작 시간 측정용 (bench.py --startup): 첫 화면을 그린 뒤 바로 종료
+        exit_after_first_frame = bool(os.environ.get('TETRIS_EXIT_AFTER_FIRST_FRAME'))
 
-            self.screen.fill(BLACK)
+        while self.running:  # 전체 프로그램이 실행되는 동안 계속 루프
+            self.frame()
+            if exit_after_first_frame or not self.running:
+                break
+            self.wait()
 
-            
-
-            if self.game_started and not self.game_over:
-
-                self.draw_grid()
-                self.draw_shape(self.current_shape)
-                self.draw_next_shape_and_score()  # 다음 블록과 점수를 화면에 표시
-
-                if not self.paused:
-
-                    # 블록이 일정 시간마다 떨어지도록 처리
-                    if current_time - self.drop_time > self.drop_speed:
-                        if not self.move_shape(0, 1):
-                            self.lock_shape()
-                        self.drop_time = current_time
-
-                    self.handle_input()
-
-                else:
-                    # 게임이 일시정지된 상태에서는 그리드 업데이트 중단
-                    pass
-
-
-            elif self.game_over:
-                # 게임 종료 시 테두리와 'Game Over' 메시지 표시
-                self.draw_border()  # 게임 오버 시에도 테두리를 그리기
-                self.display_game_over()                
-
-            # 버튼 그리기 (Pause/Resume 버튼은 게임 중에만 표시)
-            if self.pause_button:
-                self.pause_button.draw(self.screen)
-
-            self.start_button.draw(self.screen)
-            self.quit_button.draw(self.screen)
-
-            # 게임이 시작되기 전에만 속도 선택 버튼을 보여줌
-            if not self.game_started:
-                self.speed_button1.draw(self.screen)
-                self.speed_button2.draw(self.screen)
-                self.speed_button3.draw(self.screen)
-
-            pygame.display.flip()
+        self.save_replay()  # 게임 도중 창을 닫았으면 진행 중이던 게임도 저장
+        self.telemetry.close()  # 남은 기록을 파일에 씀
+        # 프로그램이 종료될 때만 pygame.quit()을 호출
+        pygame.quit()
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False  # 창을 닫기 위해서는 running을 False로 설정
+    def frame(self):
+        """
+        루프 한 번을 실행하는 함수. 흐른 실제 시간만큼 로직을 고정 간격으로 진행하고,
+        이벤트를 처리한 뒤, 그릴 때가 되었으면 화면을 그립니다.
+        """
+        now = time.perf_counter() * 1000
+        profiler = self.profiler
+        profiler.begin_frame()
+
+        if self.last_time is not None:
+            self.accumulator = min(self.accumulator + now - self.last_time, MAX_CATCHUP)
+        self.last_time = now
+        while self.accumulator >= LOGIC_STEP:
+            self.accumulator -= LOGIC_STEP
+            self.update(LOGIC_STEP)
+        profiler.mark('logic')
+
+        self.handle_events()
+        profiler.mark('events')
+
+        # 화면이 바뀌었을 때만 그리되, 초당 FPS번을 넘지 않음
+        self.render_pending = now < self.next_render
+        if not self.render_pending and self.render():
+            self.next_render = max(self.next_render + 1000 / FPS, now)
+            profiler.end_frame()
+        self.frame_us = int((time.perf_counter() * 1000 - now) * 1000)
+
+    def next_deadline(self):
+        """
+        다음 로직 일(중력, 키 자동 반복)이 생기는 실제 시각(밀리초)을 반환하는 함수.
+        진행 중인 게임이 없으면(메뉴, 일시정지, 게임 오버) 입력 전에는 할 일이 없으므로 None을 반환합니다.
+        """
+        if not self.playing() or self.last_time is None:
+            return None
+        due = self.sim_time + self.drop_speed - self.drop_timer
+        if self.controls.held:
+            due = min(due, min(self.controls.held.values()))
+        # 로직은 LOGIC_STEP 단위로만 진행되므로 그 시각을 넘는 첫 단계가 끝나는 때까지
+        steps = max(1, math.ceil((due - self.sim_time) / LOGIC_STEP))
+        return self.last_time + steps * LOGIC_STEP - self.accumulator
+
+    def wait(self):
+        """
+        다음 할 일(로직, 못 그린 화면)까지 이벤트를 기다리는 함수.
+        할 일이 없으면 입력이 올 때까지 잠들고, 받은 이벤트는 다음 handle_events()에서 처리합니다.
+        """
+        deadline = self.next_deadline()
+        if self.render_pending or self.profiler.show_overlay:
+            deadline = self.next_render if deadline is None else min(deadline, self.next_render)
+        if deadline is None:
+            event = pygame.event.wait()
+        else:
+            timeout = math.ceil(deadline - time.perf_counter() * 1000)
+            if timeout <= 0:
+                return
+            event = pygame.event.wait(timeout)
+        if event.type != pygame.NOEVENT:
+            self.pending_event = event
+
+    def dirty_rects(self):
+        """
+        지난 화면 이후 바뀐 영역(pygame.Rect) 목록을 반환하는 함수. 바뀐 것이 없으면 빈 목록입니다.
+        게임 상태가 바뀌면 전체, 보드가 바뀌면 보드 영역, 블록만 움직였으면 블록과 그림자의 전후 위치만 다시 보냅니다.
+        """
+        engine = self.engine
+        renderer = self.renderer
+        last = self.drawn
+        state = {'mode': (self.game_started, self.game_over, self.playing(), self.profiler.show_overlay)}
+        if self.game_started and not self.game_over:
+            state['board'] = (engine.board_version, renderer.scroll_x, renderer.scroll_y)
+            state['piece'] = (engine.current_shape, engine.ghost_piece())
+            state['hud'] = (engine.next_shape.index, engine.score)
+        buttons = self.visible_buttons()
+        for button in buttons:
+            state[button] = (button.text, button.hovered())
+        self.drawn = state
+
+        # 성능 표시는 보드 위에 겹쳐 그리므로 켜져 있으면 매번 전체를 보냄
+        if self.full_redraw or state['mode'] != last.get('mode') or self.profiler.show_overlay:
+            self.full_redraw = False
+            return [self.screen.get_rect()]
+        rects = []
+        if state.get('board') != last.get('board'):
+            rects.append(renderer.background.get_rect())
+        elif state.get('piece') != last.get('piece'):
+            rects += filter(None, map(renderer.piece_rect, last['piece'] + state['piece']))
+        if state.get('hud') != last.get('hud'):
+            rects.append(HUD_RECT)
+        rects += [button.rect for button in buttons if state[button] != last.get(button)]
+        return rects
+
+    def visible_buttons(self):
+        """
+        지금 화면에 보이는 버튼 목록을 반환하는 함수.
+        """
+        buttons = [self.pause_button] if self.pause_button else []
+        buttons += [self.start_button, self.quit_button]
+        # 게임이 시작되기 전에만 속도 선택 버튼을 보여줌
+        if not self.game_started:
+            buttons += [self.speed_button1, self.speed_button2, self.speed_button3]
+        return buttons
+
+    def draw_playfield(self):
+        """
+        보드, 떨어지는 블록, 다음 블록과 점수(게임 중) 또는 Game Over 메시지(게임 종료)를 그리는 함수.
+        버튼은 그리지 않으므로 리플레이 내보내기(export.py)에서도 그대로 씁니다.
+        """
+        profiler = self.profiler
+        if self.game_started and not self.game_over:
+            self.draw_grid()
+            self.renderer.draw_ghost(self.screen, self.engine.ghost_piece())  # 블록이 떨어질 위치 미리보기
+            profiler.mark('draw_grid')
+            self.draw_shape(self.engine.current_shape)
+            profiler.mark('draw_shape')
+            self.draw_next_shape_and_score()  # 다음 블록과 점수를 화면에 표시
+            profiler.mark('hud')
+
+        elif self.game_over:
+            # 게임 종료 시 테두리와 'Game Over' 메시지 표시
+            self.draw_border()  # 게임 오버 시에도 테두리를 그리기
+            self.display_game_over()
+
+    def render(self):
+        """
+        화면을 그리는 함수. 바뀐 영역이 없으면 아무것도 하지 않고 False를 반환합니다.
+        장면 전체를 화면 버퍼에 그린 뒤 바뀐 영역만 display.update()로 보냅니다.
+        """
+        if self.game_started and not self.game_over:
+            self.renderer.follow(self.engine, self.engine.current_shape)  # 큰 보드에서는 블록을 따라 스크롤
+        rects = self.dirty_rects()
+        if not rects:
+            return False
 
-                # 버튼 클릭 이벤트 처리
-                if self.pause_button:
-                    self.pause_button.check_click(event)
-                self.start_button.check_click(event)
-                self.quit_button.check_click(event)
+        profiler = self.profiler
+        self.screen.fill(BLACK)
+        profiler.mark('fill')
 
-                # 게임 시작 전 속도 선택 버튼 처리
-                if not self.game_started:
-                    self.speed_button1.check_click(event)
-                    self.speed_button2.check_click(event)
-                    self.speed_button3.check_click(event)
+        self.draw_playfield()
 
-            # Quit 버튼을 눌렀을 때는 게임만 멈추지만 창은 계속 열려 있음
-            if self.game_over:
-                self.game_started = False  # 게임이 끝났으니 다시 시작할 수 있음
+        # 버튼 그리기 (Pause/Resume 버튼은 게임 중에만 표시)
+        for button in self.visible_buttons():
+            button.draw(self.screen)
+        profiler.mark('hud')
 
-            self.clock.tick(30)
+        profiler.draw_overlay(self.screen, get_font(20), YELLOW)
+        profiler.mark('overlay')
 
-        # 프로그램이 종료될 때만 pygame.quit()을 호출
-        pygame.quit()
+        pygame.display.update(rects)
+        profiler.mark('flip')
+        return True
 
 if __name__ == "__main__":
-    Tetris().run()
+    # python tetris2.py [너비 높이] : 큰 보드로 실행
+    Tetris(*map(int, sys.argv[1:3])).run()
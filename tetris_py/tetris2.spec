@@ -1,5 +1,14 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+# 게임은 pygame의 display/font/draw만 씀. pygame이 있으면 가져가 보는 numpy(surfarray), pkg_resources(pkgdata)와
+# 표준 라이브러리 중 쓰지 않는 패키지는 묶지 않음 (실행 파일 크기와 시작 시간이 줄어듦)
+EXCLUDES = [
+    'numpy', 'setuptools', 'pkg_resources', 'distutils', 'psutil', 'packaging', 'platformdirs', 'wheel',
+    'pygame.examples', 'pygame.tests', 'pygame.docs', 'pygame.surfarray', 'pygame.sndarray', 'pygame._sdl2.audio',
+    'tkinter', 'unittest', 'doctest', 'pydoc', 'pdb', 'http', 'email', 'xml', 'xmlrpc', 'html',
+    'tarfile', 'bz2', 'lzma', 'sqlite3', 'asyncio', 'concurrent', 'multiprocessing',
+    'ssl', 'lib2to3', 'curses',
+]
 
 a = Analysis(
     ['tetris2.py'],
@@ -10,7 +19,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=EXCLUDES,
     noarchive=False,
     optimize=0,
 )
@@ -0,0 +1,410 @@
+"""
+터미널(curses) 테트리스 front-end 모듈.
+SSH 접속이나 화면 없는 서버에서 게임을 하거나 봇 게임을 지켜보기 위한 것으로, 게임 규칙은 tetris2와 같이 TetrisEngine이 맡습니다.
+매 프레임 화면 전체를 글자 격자(칸마다 (글자, 속성))로 만든 뒤 직전 프레임과 줄 단위로 비교하고,
+바뀐 줄에서는 바뀐 칸이 이어진 구간만 씁니다. 블록이 한 칸 움직이면 그 주변 몇 칸만 터미널로 나갑니다.
+입력이 오거나 다음 중력(봇 액션) 시각이 될 때까지 getch()에서 기다리므로, 가만히 있을 때는 CPU를 쓰지 않습니다.
+터미널은 키를 뗀 순간을 알려 주지 않으므로 자동 반복(DAS/ARR) 대신 터미널의 키 반복을 그대로 씁니다.
+
+조작: 방향키(또는 h/j/k/l) 이동/회전, 스페이스바 떨어뜨리기, p 일시정지, 1/2/3 속도, r 새 게임, q 종료
+Windows에서는 windows-curses 패키지가 필요합니다.
+
+사용법: python tetris_curses.py [--width 너비] [--height 높이] [--speed 밀리초] [--seed 수] [--bot]
+"""
+import argparse
+import curses
+import sys
+import time
+
+from engine import TetrisEngine, GRID_WIDTH, GRID_HEIGHT, LEFT, RIGHT, DOWN, ROTATE, DROP
+from replay import ReplayRecorder
+
+# 키 -> 액션
+KEY_BINDINGS = {
+    curses.KEY_LEFT: LEFT, ord('h'): LEFT,
+    curses.KEY_RIGHT: RIGHT, ord('l'): RIGHT,
+    curses.KEY_DOWN: DOWN, ord('j'): DOWN,
+    curses.KEY_UP: ROTATE, ord('k'): ROTATE,
+    ord(' '): DROP,
+}
+# 속도 키 -> 중력 간격 (밀리초, tetris2의 Speed 1/2/3 버튼과 같음)
+SPEED_KEYS = {ord('1'): 500, ord('2'): 250, ord('3'): 125}
+
+# 봇이 액션 하나를 넣는 간격과 게임이 끝난 뒤 새 게임까지 기다리는 시간 (밀리초)
+BOT_STEP = 60
+BOT_RESTART = 2000
+# 중력이 이보다 많이 밀리면(터미널을 멈췄다 다시 켠 경우 등) 밀린 중력을 버림 (밀리초)
+MAX_CATCHUP = 1000
+
+# 칸 하나는 글자 두 개 폭
+EMPTY_CELL = ' .'
+BLOCK_CELL = '[]'
+GHOST_CELL = '::'
+BLANK = (' ', 0)
+# 보드 오른쪽 정보 영역의 폭 (글자)
+PANEL_WIDTH = 24
+# 블록 번호(1~7) -> curses 색 (tetris2의 SHAPE_COLORS 순서: 청록, 노랑, 자홍, 주황, 파랑, 초록, 빨강)
+# 주황은 256색 터미널에서만 있으므로 8색 터미널에서는 흰색으로 그림
+ORANGE_256 = 208
+SHAPE_COLORS = (curses.COLOR_CYAN, curses.COLOR_YELLOW, curses.COLOR_MAGENTA, ORANGE_256,
+                curses.COLOR_BLUE, curses.COLOR_GREEN, curses.COLOR_RED)
+HELP = ("arrows/hjkl move", "up/k rotate", "space drop", "p pause  1-3 speed", "r new game  q quit")
+
+
+def now_ms():
+    """
+    밀리초 단위 시각을 반환하는 함수.
+    """
+    return time.monotonic() * 1000
+
+
+def init_colors():
+    """
+    블록 번호별 curses 속성 목록을 만드는 함수. 색을 쓸 수 없는 터미널에서는 모두 굵은 글씨입니다.
+    """
+    attrs = [curses.A_DIM] + [curses.A_BOLD] * len(SHAPE_COLORS)
+    if not curses.has_colors():
+        return attrs
+    curses.start_color()
+    try:
+        curses.use_default_colors()
+        background = -1
+    except curses.error:
+        background = curses.COLOR_BLACK
+    for i, color in enumerate(SHAPE_COLORS, 1):
+        if color >= curses.COLORS:
+            color = curses.COLOR_WHITE
+        curses.init_pair(i, color, background)
+        attrs[i] = curses.color_pair(i) | curses.A_BOLD
+    return attrs
+
+
+def changed_runs(old, new, limit):
+    """
+    new 줄(칸마다 (글자, 속성))에서 old와 다른 칸이 이어진 구간을 [(x, 글자들, 속성)]으로 반환하는 함수.
+    속성이 바뀌는 곳에서는 구간을 나누며, limit 글자까지만 봅니다.
+    """
+    runs = []
+    end = min(len(new), limit)
+    known = len(old)
+    x = 0
+    while x < end:
+        if x < known and old[x] == new[x]:
+            x += 1
+            continue
+        start = x
+        attr = new[x][1]
+        chars = []
+        while x < end and new[x][1] == attr and (x >= known or old[x] != new[x]):
+            chars.append(new[x][0])
+            x += 1
+        runs.append((start, ''.join(chars), attr))
+    return runs
+
+
+def follow(scroll, start, length, view, board, margin=4):
+    """
+    [start, start + length) 구간이 뷰 가장자리에서 margin칸 안쪽에 보이도록 옮긴 스크롤 위치를 반환하는 함수.
+    (render.BoardRenderer.follow와 같은 규칙, 한 축만)
+    """
+    if view >= board:
+        return 0
+    edge = min(margin, (view - length) // 2)
+    if start - edge < scroll:
+        scroll = start - edge
+    elif start + length + edge > scroll + view:
+        scroll = start + length + edge - view
+    return max(0, min(scroll, board - view))
+
+
+class TerminalRenderer:
+    """
+    글자 격자 프레임을 직전 프레임과 비교해 바뀐 칸만 curses 화면에 쓰는 클래스.
+    frames와 cells에 화면에 반영한 프레임 수와 쓴 칸(글자) 수를 셉니다.
+    """
+    def __init__(self, window):
+        self.window = window
+        self.previous = []      # 직전에 쓴 프레임 (줄마다 (글자, 속성) 튜플)
+        self.frames = 0
+        self.cells = 0
+
+    def invalidate(self):
+        """
+        다음 프레임은 화면 전체를 다시 쓰게 하는 함수 (터미널 크기가 바뀌었을 때).
+        """
+        self.window.clear()
+        self.previous = []
+
+    def draw(self, frame):
+        """
+        frame(줄 목록)을 직전 프레임과 비교하여 바뀐 칸만 쓰고 화면에 반영하는 함수. 쓴 칸 수를 반환합니다.
+        """
+        window = self.window
+        rows, columns = window.getmaxyx()
+        previous = self.previous
+        written = 0
+        for y, line in enumerate(frame[:rows]):
+            old = previous[y] if y < len(previous) else ()
+            if line == old:
+                continue
+            # 오른쪽 아래 끝 칸에 쓰면 커서가 화면 밖으로 나가 오류가 나므로 마지막 줄은 한 칸 덜 씀
+            for x, text, attr in changed_runs(old, line, columns - 1 if y == rows - 1 else columns):
+                window.addstr(y, x, text, attr)
+                written += len(text)
+        self.previous = frame
+        if written:
+            window.refresh()
+            self.frames += 1
+            self.cells += written
+        return written
+
+
+class TerminalTetris:
+    """
+    터미널에서 게임을 진행하는 클래스. bot이 참이면 PlacementBot이 두고 사람은 지켜보기만 합니다.
+    """
+    def __init__(self, window, width=GRID_WIDTH, height=GRID_HEIGHT, speed=500, seed=None, bot=False):
+        self.window = window
+        self.renderer = TerminalRenderer(window)
+        self.attrs = init_colors()
+        self.engine = TetrisEngine(width=width, height=height)
+        self.seed = seed            # 첫 게임의 seed (없으면 게임마다 새 seed)
+        self.drop_speed = speed     # 중력 간격 (밀리초)
+        self.bot = None
+        if bot:
+            from bot import PlacementBot
+            self.bot = PlacementBot(workers=1)
+        self.queue = []             # 봇이 넣을 남은 액션
+        self.planned = None         # queue를 계획한 블록 (engine.pieces 값)
+        self.recorder = None
+        self.paused = False
+        self.running = True
+        self.scroll_x = 0           # 보드 뷰의 왼쪽 위 칸 (큰 보드에서 블록을 따라 스크롤)
+        self.scroll_y = 0
+        self.messages = []          # 끝난 뒤 터미널에 출력할 글 (저장한 리플레이 경로)
+        self.start_game()
+
+    def start_game(self):
+        """
+        새 게임을 시작하는 함수. 입력은 기록기를 거쳐 엔진에 전달됩니다.
+        """
+        self.engine.reset(self.seed)
+        if self.seed is not None:
+            self.seed += 1
+        self.recorder = ReplayRecorder(self.engine)
+        self.queue = []
+        self.paused = False
+        now = now_ms()
+        self.next_drop = now + self.drop_speed
+        self.next_bot = now + BOT_STEP
+        self.restart_at = None
+
+    def save_replay(self):
+        """
+        진행 중이던 게임의 리플레이를 replays 폴더에 저장하는 함수.
+        """
+        if self.recorder:
+            self.messages.append(f"Replay saved to {self.recorder.save()}")
+            self.recorder = None
+
+    def playing(self):
+        """
+        게임이 진행 중(종료 전, 일시정지 아님)인지 확인하는 함수.
+        """
+        return not self.engine.game_over and not self.paused
+
+    def check_game_over(self, now):
+        """
+        게임이 끝났으면 리플레이를 저장하고, 봇 게임이면 잠시 뒤 새 게임을 시작하도록 하는 함수.
+        """
+        if self.engine.game_over and self.recorder:
+            self.save_replay()
+            if self.bot:
+                self.restart_at = now + BOT_RESTART
+
+    def handle_key(self, key, now):
+        """
+        키 입력 하나를 처리하는 함수.
+        """
+        if key == ord('q'):
+            self.running = False
+        elif key == ord('r'):
+            self.save_replay()
+            self.start_game()
+        elif key == ord('p') and not self.engine.game_over:
+            self.paused = not self.paused
+            self.next_drop = now + self.drop_speed
+            self.next_bot = now + BOT_STEP
+        elif key in SPEED_KEYS:
+            self.drop_speed = SPEED_KEYS[key]
+        elif key == curses.KEY_RESIZE:
+            curses.update_lines_cols()
+            self.renderer.invalidate()
+        elif key in KEY_BINDINGS and not self.bot and self.playing():
+            self.recorder.step(KEY_BINDINGS[key])
+            self.check_game_over(now)
+
+    def update(self, now):
+        """
+        now 시각까지 밀린 봇 액션과 중력을 적용하는 함수.
+        """
+        if self.restart_at is not None and now >= self.restart_at:
+            self.start_game()
+        if not self.playing():
+            return
+        if now - self.next_drop > MAX_CATCHUP:
+            self.next_drop = now
+        if self.bot:
+            while self.next_bot <= now and not self.engine.game_over:
+                self.next_bot += BOT_STEP
+                if not self.queue or self.planned != self.engine.pieces:
+                    # 중력이 먼저 블록을 고정했으면 남은 액션을 버리고 새 블록으로 다시 계획
+                    self.plan_bot_move()
+                if self.queue:
+                    self.recorder.step(self.queue.pop(0))
+            self.next_bot = max(self.next_bot, now - MAX_CATCHUP)
+        while self.next_drop <= now and not self.engine.game_over:
+            self.next_drop += self.drop_speed
+            self.recorder.tick()
+        self.check_game_over(now)
+
+    def plan_bot_move(self):
+        """
+        봇이 고른 배치로 가는 액션들을 queue에 넣는 함수. 놓을 자리가 없으면 바로 떨어뜨립니다.
+        """
+        from bot import placement_actions
+        choice = self.bot.choose(self.engine)
+        self.planned = self.engine.pieces
+        self.queue = placement_actions(self.engine.current_shape, *choice) if choice else [DROP]
+
+    def next_timeout(self, now):
+        """
+        다음 중력/봇 액션/새 게임까지 남은 시간(밀리초)을 반환하는 함수. 기다릴 일이 없으면 -1(입력이 올 때까지).
+        """
+        deadlines = []
+        if self.restart_at is not None:
+            deadlines.append(self.restart_at)
+        if self.playing():
+            deadlines.append(self.next_drop)
+            if self.bot:
+                deadlines.append(self.next_bot)
+        if not deadlines:
+            return -1
+        return max(0, int(min(deadlines) - now + 0.999))
+
+    def build_frame(self, rows, columns):
+        """
+        지금 화면을 rows x columns 글자 격자(줄마다 (글자, 속성) 튜플)로 만드는 함수.
+        보드가 터미널보다 크면 떨어지는 블록을 따라 스크롤하여 보이는 부분만 그립니다.
+        """
+        canvas = [[BLANK] * columns for _ in range(rows)]
+
+        def put(y, x, text, attr=0):
+            if 0 <= y < rows:
+                line = canvas[y]
+                for i, char in enumerate(text, x):
+                    if 0 <= i < columns:
+                        line[i] = (char, attr)
+
+        engine = self.engine
+        attrs = self.attrs
+        width, height = engine.width, engine.height
+        view_columns = max(1, min(width, (columns - PANEL_WIDTH - 2) // 2))
+        view_rows = max(1, min(height, rows - 1))
+        piece = engine.current_shape
+        if not engine.game_over:
+            state = piece.state
+            self.scroll_x = follow(self.scroll_x, piece.x, state.width, view_columns, width)
+            self.scroll_y = follow(self.scroll_y, piece.y, state.height, view_rows, height)
+        left, top = self.scroll_x, self.scroll_y
+
+        # 보드 (칸마다 글자 두 개)
+        cells = engine.cells
+        for y in range(view_rows):
+            start = (top + y) * width + left
+            put(y, 0, '|')
+            for x, cell in enumerate(cells[start:start + view_columns]):
+                put(y, 1 + 2 * x, BLOCK_CELL if cell else EMPTY_CELL, attrs[cell])
+            put(y, 1 + 2 * view_columns, '|')
+        put(view_rows, 0, '+' + '--' * view_columns + '+')
+
+        if not engine.game_over:
+            for shape, text, extra in ((engine.ghost_piece(), GHOST_CELL, curses.A_DIM),
+                                       (piece, BLOCK_CELL, 0)):
+                attr = attrs[shape.id] & ~curses.A_BOLD | extra if extra else attrs[shape.id]
+                for dx, dy in shape.cells:
+                    x, y = shape.x + dx - left, shape.y + dy - top
+                    if 0 <= x < view_columns and 0 <= y < view_rows:
+                        put(y, 1 + 2 * x, text, attr)
+
+        # 오른쪽 정보 영역
+        px = 2 * view_columns + 4
+        put(0, px, "Next:")
+        next_shape = engine.next_shape
+        for dx, dy in next_shape.cells:
+            put(1 + dy, px + 2 * dx, BLOCK_CELL, attrs[next_shape.id])
+        put(6, px, f"Score: {engine.score}")
+        put(7, px, f"Lines: {engine.lines}")
+        put(8, px, f"Speed: {self.drop_speed}ms")
+        status = "GAME OVER" if engine.game_over else "PAUSED" if self.paused else "BOT" if self.bot else ""
+        put(10, px, status, curses.A_BOLD | curses.A_REVERSE if status else 0)
+        for i, line in enumerate(HELP):
+            put(12 + i, px, line, curses.A_DIM)
+        return [tuple(line) for line in canvas]
+
+    def render(self):
+        """
+        화면 프레임을 만들어 바뀐 칸만 터미널에 쓰는 함수.
+        """
+        rows, columns = self.window.getmaxyx()
+        self.renderer.draw(self.build_frame(rows, columns))
+
+    def run(self):
+        """
+        입력이나 다음 중력 시각까지 기다리며 게임을 진행하는 루프.
+        """
+        window = self.window
+        window.keypad(True)
+        try:
+            curses.curs_set(0)
+        except curses.error:
+            pass    # 커서를 숨길 수 없는 터미널
+        while self.running:
+            self.render()
+            window.timeout(self.next_timeout(now_ms()))
+            key = window.getch()
+            now = now_ms()
+            if key != -1:
+                self.handle_key(key, now)
+            self.update(now)
+        self.save_replay()
+        if self.bot:
+            self.bot.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play or watch Tetris in a terminal (curses)")
+    parser.add_argument('--width', type=int, default=GRID_WIDTH)
+    parser.add_argument('--height', type=int, default=GRID_HEIGHT)
+    parser.add_argument('--speed', type=int, default=500, help="gravity interval in ms")
+    parser.add_argument('--seed', type=int, default=None, help="seed of the first game")
+    parser.add_argument('--bot', action='store_true', help="let the placement bot play")
+    args = parser.parse_args()
+    if args.bot and (args.width, args.height) != (GRID_WIDTH, GRID_HEIGHT):
+        parser.error("--bot only supports the default board size")
+
+    def play(window):
+        game = TerminalTetris(window, args.width, args.height, args.speed, args.seed, args.bot)
+        game.run()
+        return game
+
+    game = curses.wrapper(play)
+    for message in game.messages:
+        print(message)
+    renderer = game.renderer
+    print(f"{renderer.frames} frames, {renderer.cells / max(renderer.frames, 1):.1f} cells written per frame")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
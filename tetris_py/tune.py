@@ -0,0 +1,253 @@
+"""
+봇 평가 가중치(bot.WEIGHTS: 높이 합, 지운 줄 수, 구멍 수, 울퉁불퉁함)를 자동으로 찾는 튜너 모듈.
+CMA 방식을 단순화한 진화 전략을 씁니다. 평균과 열마다의 표준편차로 후보를 뽑고, 점수가 좋은 절반의 가중 평균으로
+평균을 옮기며, 표준편차도 그 절반의 퍼짐에 맞춰 줄입니다.
+후보마다 같은 seed 목록의 게임을 화면 없이 진행하고, 점수(엔진의 줄 제거 점수) 평균을 적합도로 씁니다.
+게임들은 프로세스 풀의 모든 코어에 나누어 돌리며, 작업 프로세스마다 엔진 하나를 만들어 계속 다시 씁니다.
+같은 seed의 게임은 후보끼리 같은 보드를 자주 다시 만나므로, 한 작업 프로세스에 몰아 보내 봇의 보드 해시 캐시를 함께 씁니다.
+세대마다 상태를 체크포인트 파일(JSON)에 저장하므로 중단한 뒤 --resume으로 이어서 돌릴 수 있습니다.
+
+사용법: python tune.py [--population 수] [--games 수] [--max-pieces 수] [--generations 수] [--workers 수]
+                       [--checkpoint 경로] [--resume]
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bot import WEIGHTS, best_single, search_chunk, cached_placements, placement_actions
+from engine import TetrisEngine
+
+# 가중치 순서 (벡터 <-> bot.WEIGHTS 사전 변환용)
+FEATURES = tuple(WEIGHTS)
+CHECKPOINT_VERSION = 1
+# 표준편차가 모두 이보다 작아지면 수렴한 것으로 보고 멈춤
+MIN_SIGMA = 1e-3
+
+# 작업 프로세스마다 다시 쓰는 엔진 (init_worker에서 만듦)
+worker_engine = None
+
+
+def init_worker():
+    """
+    작업 프로세스가 시작될 때 한 번 엔진을 만드는 함수.
+    """
+    global worker_engine
+    worker_engine = TetrisEngine()
+
+
+def play_game(weights, seed, max_pieces, lookahead=False):
+    """
+    weights로 seed 게임을 최대 max_pieces개 블록까지 진행하고 (점수, 줄 수, 블록 수)를 반환하는 함수 (프로세스 풀 작업 단위).
+    lookahead가 참이면 다음 블록까지 내다보고(PlacementBot과 같음), 아니면 현재 블록만 보고 배치를 고릅니다.
+    """
+    engine = worker_engine or TetrisEngine()
+    engine.reset(seed)
+    while not engine.game_over and engine.pieces < max_pieces:
+        piece = engine.current_shape
+        rows = engine.rows
+        if lookahead:
+            candidates = cached_placements(rows, engine.board_hash, piece.index, piece.rotation, piece.x, piece.y)
+            best = candidates and search_chunk(rows, engine.heights, candidates, piece.index, piece.y,
+                                               engine.next_shape.index, weights, engine.board_hash)
+        else:
+            best = best_single(rows, piece.index, piece.rotation, piece.x, piece.y, 0, weights, engine.board_hash)
+        if not best:
+            break
+        for action in placement_actions(piece, best[1], best[2]):
+            engine.step(action)
+    return engine.score, engine.lines, engine.pieces
+
+
+def to_weights(vector):
+    """
+    가중치 벡터를 bot.WEIGHTS 형식의 사전으로 바꾸는 함수.
+    """
+    return dict(zip(FEATURES, vector))
+
+
+def normalize(vector):
+    """
+    벡터를 길이 1로 맞추는 함수. 배치는 점수의 크기가 아니라 순서로만 고르므로 길이는 결과에 영향이 없습니다.
+    """
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class Tuner:
+    """
+    진화 전략으로 가중치를 찾는 클래스. 상태(평균, 표준편차, 최고 기록, 기록, 난수 상태)는 모두 체크포인트에 저장됩니다.
+    """
+    def __init__(self, population=16, games=8, max_pieces=500, seed=0, sigma=0.3, lookahead=False):
+        self.settings = {'population': population, 'games': games, 'max_pieces': max_pieces,
+                         'seed': seed, 'lookahead': lookahead}
+        self.seeds = [seed + i for i in range(games)]   # 모든 후보가 같은 게임들로 평가됨
+        self.rng = random.Random(seed)
+        self.mean = normalize([WEIGHTS[name] for name in FEATURES])
+        self.sigma = [sigma] * len(FEATURES)
+        self.generation = 0
+        self.best = None        # {'weights', 'fitness', 'lines', 'pieces'}
+        self.stale = 0          # 최고 기록이 나아지지 않은 세대 수
+        self.history = []
+        self.games_played = 0
+        self.elapsed = 0.0
+
+    def sample(self):
+        """
+        평균과 표준편차로 후보 가중치 벡터를 population개 뽑는 함수. 첫 후보는 현재 평균입니다.
+        """
+        candidates = [self.mean]
+        for _ in range(self.settings['population'] - 1):
+            candidates.append(normalize([m + s * self.rng.gauss(0.0, 1.0) for m, s in zip(self.mean, self.sigma)]))
+        return candidates
+
+    def evaluate(self, pool, candidates, workers=1):
+        """
+        후보마다 모든 seed 게임을 풀에서 진행하고 (평균 점수, 평균 줄 수, 평균 블록 수) 목록을 반환하는 함수.
+        작업은 seed 순서로 늘어놓고, 작업 프로세스마다 묶음 하나 이상이 가도록 하는 한에서 같은 seed끼리 묶어 보냅니다.
+        """
+        settings = self.settings
+        population = len(candidates)
+        tasks = [(to_weights(vector), seed) for seed in self.seeds for vector in candidates]
+        chunksize = max(1, min(population, len(tasks) // workers))
+        results = list(pool.map(play_game, *zip(*tasks), [settings['max_pieces']] * len(tasks),
+                                [settings['lookahead']] * len(tasks), chunksize=chunksize))
+        self.games_played += len(tasks)
+        games = len(self.seeds)
+        return [tuple(sum(values) / games for values in zip(*results[i::population]))
+                for i in range(population)]
+
+    def update(self, candidates, fitness):
+        """
+        좋은 절반의 가중 평균으로 평균을 옮기고, 그 절반의 퍼짐으로 표준편차를 줄이는 함수.
+        최고 기록이 나아졌으면 True를 반환합니다.
+        """
+        ranked = sorted(zip(fitness, candidates), key=lambda item: item[0][0], reverse=True)
+        mu = max(1, len(ranked) // 2)
+        # 순위가 높을수록 큰 가중치 (CMA-ES의 log 가중치)
+        ranks = [math.log(mu + 0.5) - math.log(i + 1) for i in range(mu)]
+        total = sum(ranks)
+        ranks = [r / total for r in ranks]
+        selected = [vector for _, vector in ranked[:mu]]
+        old_mean = self.mean
+        self.mean = normalize([sum(r * v[d] for r, v in zip(ranks, selected)) for d in range(len(FEATURES))])
+        for d in range(len(FEATURES)):
+            spread = math.sqrt(sum(r * (v[d] - old_mean[d]) ** 2 for r, v in zip(ranks, selected)))
+            self.sigma[d] = 0.7 * self.sigma[d] + 0.3 * spread
+
+        (score, lines, pieces), vector = ranked[0]
+        if self.best is None or score > self.best['fitness']:
+            self.best = {'weights': to_weights(vector), 'fitness': score, 'lines': lines, 'pieces': pieces}
+            return True
+        return False
+
+    def step(self, pool, workers=1):
+        """
+        한 세대를 진행하고 기록 한 줄(사전)을 반환하는 함수.
+        """
+        start = time.perf_counter()
+        candidates = self.sample()
+        fitness = self.evaluate(pool, candidates, workers)
+        improved = self.update(candidates, fitness)
+        self.stale = 0 if improved else self.stale + 1
+        self.generation += 1
+        elapsed = time.perf_counter() - start
+        self.elapsed += elapsed
+        record = {'generation': self.generation, 'best': self.best['fitness'],
+                  'generation_best': max(f[0] for f in fitness),
+                  'generation_mean': sum(f[0] for f in fitness) / len(fitness),
+                  'sigma': max(self.sigma), 'seconds': elapsed}
+        self.history.append(record)
+        return record
+
+    def converged(self, patience):
+        """
+        patience 세대 동안 나아지지 않았거나 표준편차가 충분히 작아졌는지 확인하는 함수.
+        """
+        return self.stale >= patience or max(self.sigma) < MIN_SIGMA
+
+    def save(self, path):
+        """
+        상태를 체크포인트 파일에 저장하는 함수. 저장 도중 중단되어도 이전 파일이 남도록 임시 파일을 거칩니다.
+        """
+        state = {'version': CHECKPOINT_VERSION, 'settings': self.settings, 'generation': self.generation,
+                 'mean': self.mean, 'sigma': self.sigma, 'best': self.best, 'stale': self.stale,
+                 'history': self.history, 'games_played': self.games_played, 'elapsed': self.elapsed,
+                 'rng': self.rng.getstate()}
+        temp = path + '.tmp'
+        with open(temp, 'w') as f:
+            json.dump(state, f, indent=1)
+        os.replace(temp, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        체크포인트 파일에서 튜너를 되살리는 함수. 설정(seed 목록 등)도 체크포인트의 것을 씁니다.
+        """
+        with open(path) as f:
+            state = json.load(f)
+        if state.get('version') != CHECKPOINT_VERSION:
+            raise ValueError("Not a tuner checkpoint")
+        tuner = cls(**state['settings'])
+        for name in ('generation', 'mean', 'sigma', 'best', 'stale', 'history', 'games_played', 'elapsed'):
+            setattr(tuner, name, state[name])
+        version, internal, gauss_next = state['rng']
+        tuner.rng.setstate((version, tuple(internal), gauss_next))
+        return tuner
+
+    def report(self):
+        """
+        최고 가중치와 진행 요약을 문자열로 반환하는 함수. 가중치는 bot.py에 그대로 붙여 넣을 수 있는 형식입니다.
+        """
+        best = self.best
+        weights = ', '.join(f"'{name}': {value:.6f}" for name, value in best['weights'].items())
+        return (f"generations={self.generation} games={self.games_played} elapsed={self.elapsed:.1f}s "
+                f"({self.games_played / max(self.elapsed, 1e-9):.1f} games/s)\n"
+                f"best fitness={best['fitness']:.1f} lines={best['lines']:.1f} pieces={best['pieces']:.1f} "
+                f"over {len(self.seeds)} games (max {self.settings['max_pieces']} pieces)\n"
+                f"WEIGHTS = {{{weights}}}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune bot evaluation weights with an evolution strategy")
+    parser.add_argument('--population', type=int, default=16)
+    parser.add_argument('--games', type=int, default=8, help="seeded games per candidate")
+    parser.add_argument('--max-pieces', type=int, default=500, help="piece limit per game")
+    parser.add_argument('--generations', type=int, default=30, help="total generations (including resumed ones)")
+    parser.add_argument('--patience', type=int, default=6, help="stop after this many generations without improvement")
+    parser.add_argument('--sigma', type=float, default=0.3, help="initial search step")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--lookahead', action='store_true', help="also look at the next piece (slower)")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--checkpoint', default='tune_checkpoint.json')
+    parser.add_argument('--resume', action='store_true', help="continue from --checkpoint")
+    args = parser.parse_args()
+
+    if args.resume:
+        tuner = Tuner.load(args.checkpoint)
+        print(f"Resumed {args.checkpoint} at generation {tuner.generation}")
+    else:
+        tuner = Tuner(args.population, args.games, args.max_pieces, args.seed, args.sigma, args.lookahead)
+
+    workers = args.workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers, initializer=init_worker) as pool:
+        try:
+            while tuner.generation < args.generations and not tuner.converged(args.patience):
+                record = tuner.step(pool, workers)
+                tuner.save(args.checkpoint)
+                print(f"gen {record['generation']:3}: best={record['best']:.1f} "
+                      f"gen_best={record['generation_best']:.1f} gen_mean={record['generation_mean']:.1f} "
+                      f"sigma={record['sigma']:.3f} ({record['seconds']:.1f}s)", flush=True)
+        except KeyboardInterrupt:
+            print(f"Interrupted; resume with --resume --checkpoint {args.checkpoint}")
+    if tuner.best:
+        print(tuner.report())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())